@@ -0,0 +1 @@
+"""Local stub API and load benchmarks for the UI."""
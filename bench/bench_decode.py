@@ -0,0 +1,89 @@
+"""Decode and transport benchmark for large audit payloads.
+
+Builds an audit result with ``--findings`` findings (plus the raw per-page
+fields the API returns but the UI never renders) and reports wire size per
+content encoding, decode time with the stdlib ``json`` module and with orjson
+(when installed), and the in-memory size of the full versus trimmed result::
+
+    python -m bench.bench_decode --findings 20000
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_payload(findings, seed=0):
+    from bench.stub_server import StubConfig, StubState
+
+    result = StubState(StubConfig(findings=findings, seed=seed)).audit("https://example.com/", "full", ["base"])
+    for i, f in enumerate(result["findings"]):
+        f["raw_html"] = f"<div class='template-{i % 37}'>" + "lorem ipsum " * 40 + "</div>"
+        f["trace"] = [{"selector": f"div:nth-child({j})", "matched": j % 2 == 0} for j in range(5)]
+    result["crawl_log"] = [{"url": f"https://example.com/page/{i}", "status": 200, "ms": i % 900}
+                           for i in range(findings // 10)]
+    return json.dumps({"success": True, "data": result}).encode()
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def traced_size(build):
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--findings", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from vysalytica_ui import payloads
+
+    body = make_payload(args.findings)
+    report = {"findings": args.findings, "wire_bytes": {"identity": len(body)}, "decode_seconds": {}}
+
+    report["wire_bytes"]["gzip"] = len(gzip.compress(body, 6))
+    report["wire_bytes"]["deflate"] = len(zlib.compress(body, 6))
+    try:
+        import brotli
+        report["wire_bytes"]["br"] = len(brotli.compress(body, quality=5))
+    except ImportError:
+        report["wire_bytes"]["br"] = None
+
+    report["decode_seconds"]["json"] = round(best_of(lambda: json.loads(body), args.repeat), 4)
+    if payloads.orjson is not None:
+        report["decode_seconds"]["orjson"] = round(best_of(lambda: payloads.orjson.loads(body), args.repeat), 4)
+    else:
+        report["decode_seconds"]["orjson"] = None
+
+    data = json.loads(body)["data"]
+    trimmed = payloads.trim("/api/audit", data)
+    report["memory_bytes"] = {
+        "full": traced_size(lambda: json.loads(body)["data"]),
+        "trimmed": traced_size(lambda: payloads.trim("/api/audit", payloads.loads(body)["data"])),
+    }
+    report["serialized_bytes"] = {"full": len(json.dumps(data)), "trimmed": len(json.dumps(trimmed))}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
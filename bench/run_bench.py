@@ -0,0 +1,204 @@
+"""Load benchmark for the Streamlit UI.
+
+Drives many simulated sessions concurrently through ``streamlit.testing``'s
+``AppTest`` against the local stub API (or ``--api-base``) and reports script
+rerun latency percentiles, throughput and memory per session (peak RSS growth
+after a warm-up session). ``AppTest`` owns a process-global runtime, so each
+session runs in its own process::
+
+    python -m bench.run_bench --sessions 20 --iterations 5 --findings 5000
+    python -m bench.run_bench --max-p95 2.0   # non-zero exit on regression
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "streamlit_app.py")
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class SessionDriver:
+    """One simulated browser session: submit audits and browse their findings."""
+
+    def __init__(self, index, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.timeout = timeout
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.timings = []  # (step, seconds)
+        self.errors = []
+
+    def _run(self, step):
+        started = time.perf_counter()
+        self.at.run()
+        self.timings.append((step, time.perf_counter() - started))
+        if self.at.exception:
+            self.errors.append(f"{step}: {self.at.exception[0].value}")
+
+    def _text_input(self, label):
+        return next(t for t in self.at.text_input if t.label == label)
+
+    def _audit_finished(self):
+        # Streaming audits show partial metrics; the final view has the overall score
+        return any(m.label == "Overall Score" for m in self.at.metric)
+
+    def run_audit(self, iteration):
+        self._text_input("Website URL").input(f"https://site{self.index}-{iteration}.example.com")
+        next(b for b in self.at.button if b.label == "Run Audit").click()
+        self._run("submit_audit")
+        deadline = time.monotonic() + self.timeout
+        while not self._audit_finished() and time.monotonic() < deadline:
+            time.sleep(0.1)
+            self._run("poll_audit")
+        if not self._audit_finished():
+            self.errors.append(f"audit {iteration} did not finish within {self.timeout}s")
+            return
+        for query in ("structured", "template 3", ""):
+            self._text_input("Search title, why and fix").input(query)
+            self._run("filter_findings")
+
+    def scenario(self, iterations):
+        self._run("initial_load")
+        for i in range(iterations):
+            self.run_audit(i)
+        return self
+
+
+def max_rss_bytes():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def run_session(index, iterations, timeout):
+    """Worker process entry point: one measured session after a warm-up run.
+
+    The warm-up pays for imports and process-wide caches (client, pools), so
+    the RSS growth afterwards is what the session itself costs.
+    """
+    sys.path.insert(0, str(ROOT))
+    SessionDriver(-1 - index, timeout).scenario(1)
+    from vysalytica_ui.metrics import get_metrics
+
+    metrics = get_metrics()
+    metrics.routes.clear()
+    baseline = max_rss_bytes()
+    driver = SessionDriver(index, timeout).scenario(iterations)
+    return {
+        "timings": driver.timings,
+        "errors": driver.errors,
+        "memory_bytes": max_rss_bytes() - baseline,
+        "api": metrics.summary(),
+    }
+
+
+def merge_api_summaries(summaries):
+    merged = {}
+    for rows in summaries:
+        for row in rows:
+            m = merged.setdefault(row["route"], {"route": row["route"], "requests": 0, "errors": 0, "retries": 0,
+                                                 "bytes_in": 0, "seconds": 0.0})
+            m["requests"] += row["requests"]
+            m["errors"] += round(row["error_rate"] * row["requests"])
+            m["retries"] += row["retries"]
+            m["bytes_in"] += row["bytes_in"]
+            m["seconds"] += row["avg_s"] * row["requests"]
+    for m in merged.values():
+        seconds = m.pop("seconds")
+        m["avg_s"] = round(seconds / m["requests"], 4) if m["requests"] else 0.0
+    return sorted(merged.values(), key=lambda m: m["route"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--api-base", help="benchmark against a running API instead of the stub")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub latency per request (s)")
+    parser.add_argument("--audit-latency", type=float, default=0.5, help="stub crawl time per audit (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--findings", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", dest="json_out", help="write the report as JSON to this file")
+    parser.add_argument("--max-p95", type=float, help="fail if p95 rerun latency exceeds this (s)")
+    args = parser.parse_args()
+
+    if args.api_base:
+        os.environ["API_BASE"] = args.api_base
+    else:
+        from bench.stub_server import StubConfig, start_stub_server
+
+        server = start_stub_server(StubConfig(latency=args.latency, audit_latency=args.audit_latency,
+                                              error_rate=args.error_rate, findings=args.findings))
+        os.environ["API_BASE"] = f"http://127.0.0.1:{server.server_port}"
+
+    # A fresh audit store per run, so audits from earlier runs aren't served locally
+    store_dir = tempfile.TemporaryDirectory()
+    os.environ["AUDIT_STORE_PATH"] = os.path.join(store_dir.name, "audits.sqlite3")
+
+    started = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.sessions, mp_context=ctx) as pool:
+        futures = [pool.submit(run_session, i, args.iterations, args.timeout) for i in range(args.sessions)]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - started
+    store_dir.cleanup()
+
+    timings = [tuple(t) for r in results for t in r["timings"]]
+    all_seconds = [s for _, s in timings]
+    by_step = {}
+    for step, seconds in timings:
+        by_step.setdefault(step, []).append(seconds)
+
+    report = {
+        "sessions": args.sessions,
+        "iterations": args.iterations,
+        "findings_per_audit": args.findings,
+        "wall_seconds": round(wall, 2),
+        "reruns": len(all_seconds),
+        "reruns_per_second": round(len(all_seconds) / wall, 2),
+        "audits_per_second": round(args.sessions * args.iterations / wall, 2),
+        "rerun_seconds": {
+            "p50": round(percentile(all_seconds, 0.50), 4),
+            "p90": round(percentile(all_seconds, 0.90), 4),
+            "p95": round(percentile(all_seconds, 0.95), 4),
+            "p99": round(percentile(all_seconds, 0.99), 4),
+            "mean": round(statistics.fmean(all_seconds), 4) if all_seconds else 0.0,
+        },
+        "steps": {step: {"count": len(v), "p50": round(percentile(v, 0.5), 4), "p95": round(percentile(v, 0.95), 4)}
+                  for step, v in sorted(by_step.items())},
+        "memory_per_session_kib": round(statistics.fmean(r["memory_bytes"] for r in results) / 1024, 1),
+        "max_memory_per_session_kib": round(max(r["memory_bytes"] for r in results) / 1024, 1),
+        "api": merge_api_summaries(r["api"] for r in results),
+        "errors": [e for r in results for e in r["errors"]][:20],
+    }
+
+    print(json.dumps(report, indent=2, default=str))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2, default=str))
+
+    failed = bool(report["errors"])
+    if args.max_p95 is not None and report["rerun_seconds"]["p95"] > args.max_p95:
+        print(f"FAIL: p95 rerun latency {report['rerun_seconds']['p95']}s > {args.max_p95}s", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
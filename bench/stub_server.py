@@ -0,0 +1,273 @@
+"""Local stand-in for ``vysalytica-api``.
+
+Implements every endpoint the UI calls with the same ``{success, data, error}``
+envelope, plus knobs for latency, error injection and payload size.
+``POST /api/audit`` streams NDJSON page by page when the client accepts
+``application/x-ndjson`` (disable with ``--no-stream``)::
+
+    python -m bench.stub_server --port 8001 --latency 0.2 --error-rate 0.05 --findings 5000
+    API_BASE=http://127.0.0.1:8001 streamlit run streamlit_app.py
+"""
+import argparse
+import gzip
+import itertools
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATEGORIES = ["meta", "schema", "content", "links", "performance"]
+STATUSES = ["fail", "warn", "pass"]
+HISTORY_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # +/- uniform seconds on top of latency
+    audit_latency: float = 0.0  # extra seconds for POST /api/audit (crawl time)
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 500
+    findings: int = 50  # findings per audit
+    pages: int = 10  # page_count per audit
+    history: int = 200  # audits available in /api/audit/history
+    stream: bool = True  # answer NDJSON-accepting audit requests with a stream
+    gzip: bool = True  # gzip JSON bodies over 1 KiB when the client accepts it
+    seed: int = 0
+
+
+def make_finding(i, rng):
+    return {
+        "id": f"rule-{i % 400}",
+        "title": f"Finding {i}: missing structured data on template {i % 37}",
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "status": STATUSES[rng.randrange(len(STATUSES))],
+        "why": "Assistants rely on structured data to identify the entity behind a page. " * 2,
+        "fix": "Add an Organization JSON-LD block to the page head.",
+        "fix_snippet": '<script type="application/ld+json">{"@type": "Organization"}</script>',
+        "evidence": f"https://example.com/page/{i}",
+    }
+
+
+def score_of(findings):
+    return 100 - sum(1 for f in findings if f["status"] == "fail") * 100 // max(1, len(findings))
+
+
+class StubState:
+    def __init__(self, config):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.audit_ids = itertools.count(1)
+        self.audits = {}
+        self.lock = threading.Lock()
+
+    def audit(self, url, plan, packs):
+        with self.lock:
+            audit_id = next(self.audit_ids)
+            findings = [make_finding(i, self.rng) for i in range(self.config.findings)]
+        result = {
+            "audit_id": audit_id, "url": url, "plan": plan, "packs": packs,
+            "page_count": self.config.pages, "scores": {"overall": score_of(findings)}, "findings": findings,
+        }
+        with self.lock:
+            self.audits[audit_id] = result
+        return result
+
+    def history(self, limit, offset, domain=None):
+        rows = []
+        for i in range(offset, min(offset + limit, self.config.history)):
+            audit_id = self.config.history - i
+            rows.append({
+                "id": audit_id, "domain": domain or "example.com", "url": f"https://{domain or 'example.com'}/",
+                "overall_score": 40 + audit_id % 60, "page_count": self.config.pages,
+                "created_at": (HISTORY_START + timedelta(hours=6 * audit_id)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "packs": ["base"],
+            })
+        return rows
+
+    def audit_detail(self, audit_id):
+        with self.lock:
+            audit = self.audits.get(audit_id)
+        if audit is None:
+            audit = {"audit_id": audit_id, "page_count": self.config.pages, "scores": {"overall": 70},
+                     "findings": [make_finding(i, self.rng) for i in range(self.config.findings)]}
+        return audit
+
+    def answer_graph(self, domain, intents, graph_id=None):
+        return {
+            "id": graph_id, "domain": domain, "priority_score": len(intents),
+            "created_at": "2026-01-01T00:00:00Z",
+            "intents": [{"intent": intent, "assistants": {
+                a: {"cited": self.rng.random() < 0.4, "sources": [f"https://source{j}.com" for j in range(3)]}
+                for a in ("chatgpt", "claude")}} for intent in intents],
+        }
+
+
+def make_handler(state):
+    config = state.config
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _delay(self, extra=0.0):
+            delay = config.latency + extra + (random.uniform(-config.jitter, config.jitter) if config.jitter else 0)
+            if delay > 0:
+                time.sleep(delay)
+
+        def _write(self, status, body, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if (config.gzip and content_type == "application/json" and len(body) > 1024
+                    and "gzip" in self.headers.get("Accept-Encoding", "")):
+                body = gzip.compress(body, 6)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _ok(self, data):
+            self._write(200, json.dumps({"success": True, "data": data}).encode())
+
+        def _fail_injected(self):
+            if config.error_rate and random.random() < config.error_rate:
+                self._write(500, b"injected error", "text/plain")
+                return True
+            return False
+
+        def _stream_audit(self, result):
+            # Chunked NDJSON: one progress event and one findings batch per page
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def chunk(obj):
+                line = json.dumps(obj).encode() + b"\n"
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+
+            pages = max(1, config.pages)
+            findings = result["findings"]
+            per_page = -(-len(findings) // pages) if findings else 0
+            for page in range(pages):
+                if config.audit_latency:
+                    time.sleep(config.audit_latency / pages)
+                batch = findings[page * per_page:(page + 1) * per_page]
+                chunk({"event": "progress", "pages_scanned": page + 1,
+                       "score": score_of(findings[:(page + 1) * per_page] or findings)})
+                if batch:
+                    chunk({"event": "findings", "findings": batch})
+            summary = {k: v for k, v in result.items() if k != "findings"}
+            chunk({"event": "done", "data": summary})
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _json_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            path, q = parsed.path, {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            self._delay()
+            if path == "/health":
+                return self._ok({"status": "ok"})
+            if self._fail_injected():
+                return
+            if path == "/api/audit/history":
+                return self._ok(state.history(int(q.get("limit", 10)), int(q.get("offset", 0)), q.get("domain")))
+            if path.startswith("/api/audit/"):
+                return self._ok(state.audit_detail(int(path.rsplit("/", 1)[1])))
+            if path == "/api/citations/stats":
+                return self._ok({"overall_rate": 42.0, "total_queries": 120, "chatgpt_rate": 45.0, "claude_rate": 39.0})
+            if path == "/api/answer_graph/":
+                limit, offset = int(q.get("limit", 5)), int(q.get("offset", 0))
+                return self._ok([state.answer_graph(q.get("domain", "example.com"), [f"intent {j}" for j in range(5)], i + 1)
+                                 for i in range(offset, min(offset + limit, 23))])
+            if path == "/api/keys/list":
+                return self._ok([{"name": f"key {i}", "key": f"vys_****{i:04d}", "is_active": True, "quota_per_hour": 10}
+                                 for i in range(3)])
+            if path == "/api/plans":
+                return self._ok([{"name": n, "price": p, "quota_per_hour": q}
+                                 for n, p, q in (("quickscan", 0, 5), ("full", 49, 50), ("agency", 199, 500))])
+            if path == "/api/plans/compare":
+                return self._ok({"features": ["pages", "packs"], "quickscan": [10, 1], "full": [200, 3], "agency": [5000, 3]})
+            self._write(404, b"not found", "text/plain")
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            payload = self._json_body()
+            streaming = (path == "/api/audit" and config.stream
+                         and "application/x-ndjson" in self.headers.get("Accept", ""))
+            self._delay(config.audit_latency if path == "/api/audit" and not streaming else 0.0)
+            if self._fail_injected():
+                return
+            if path == "/api/audit":
+                result = state.audit(payload.get("url"), payload.get("plan"), payload.get("packs", []))
+                return self._stream_audit(result) if streaming else self._ok(result)
+            if path == "/api/citations/track":
+                results = [{"assistant": a, "cited": state.rng.random() < 0.4,
+                            "response": f"{a} answer for {payload.get('intent')} " * 20}
+                           for a in payload.get("assistants", [])]
+                cited = sum(1 for r in results if r["cited"])
+                return self._ok({"results": results, "summary": {
+                    "rate": round(100 * cited / len(results), 1) if results else 0, "cited": cited, "total": len(results)}})
+            if path == "/api/answer_graph/build":
+                return self._ok(state.answer_graph(payload.get("domain"), payload.get("intents", [])))
+            if path == "/api/playbooks/generate":
+                return self._ok({"intent": payload.get("intent"), "target_assistant": payload.get("target_assistant"),
+                                 "priority": "high", "fixes": [
+                                     {"title": f"Fix {i}", "why": "Improves citation odds", "language": "html",
+                                      "snippet": "<p>Answer-first summary</p>"} for i in range(5)]})
+            if path == "/api/report/playbook_md":
+                return self._write(200, b"# Playbook\n\n" + json.dumps(payload).encode(), "text/markdown")
+            if path == "/api/report/playbook_docx":
+                return self._write(200, b"PK\x03\x04" + b"\x00" * 2048, "application/octet-stream")
+            if path == "/api/keys/create":
+                return self._ok({"key": f"vys_{random.getrandbits(64):016x}", "name": payload.get("name"),
+                                 "quota_per_hour": payload.get("quota_per_hour")})
+            self._write(404, b"not found", "text/plain")
+
+    return Handler
+
+
+def start_stub_server(config=None, host="127.0.0.1", port=0):
+    """Serve the stub API on a daemon thread; returns the server (``.server_port``)."""
+    server = ThreadingHTTPServer((host, port), make_handler(StubState(config or StubConfig())))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="vys-stub-api").start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--audit-latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--findings", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--history", type=int, default=200)
+    parser.add_argument("--no-stream", action="store_true", help="always answer audits with plain JSON")
+    parser.add_argument("--no-gzip", action="store_true", help="never compress responses")
+    args = parser.parse_args()
+    config = StubConfig(latency=args.latency, jitter=args.jitter, audit_latency=args.audit_latency,
+                        error_rate=args.error_rate, findings=args.findings, pages=args.pages,
+                        history=args.history, stream=not args.no_stream, gzip=not args.no_gzip)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(config)))
+    print(f"Stub API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Vysalytica Streamlit UI."""
@@ -0,0 +1,136 @@
+"""Compact node/edge view of an answer graph payload.
+
+The API returns a nested JSON tree (domain -> intents -> assistant answers ->
+cited sources). ``CompactGraph`` flattens it once into parallel lists of node
+kinds and labels plus integer edges, which is all the graph view needs. Node
+details are kept as references into the original payload and only rendered
+when a node is opened.
+"""
+import hashlib
+import json
+
+DOMAIN = "domain"
+INTENT = "intent"
+ASSISTANT = "assistant"
+SOURCE = "source"
+
+NODE_STYLES = {
+    DOMAIN: 'shape=doubleoctagon style=filled fillcolor="#0F2B46" fontcolor=white',
+    INTENT: 'shape=box style="rounded,filled" fillcolor="#6BC4FF"',
+    ASSISTANT: 'shape=ellipse style=filled fillcolor="#E8E8E8"',
+    SOURCE: 'shape=note fontsize=10',
+}
+
+
+def graph_key(payload):
+    """Stable cache key: the stored graph ID, else a hash of the payload."""
+    if payload.get("id") is not None:
+        return f"id:{payload['id']}"
+    raw = json.dumps(payload, sort_keys=True, default=str).encode()
+    return "sha1:" + hashlib.sha1(raw).hexdigest()
+
+
+def _first(d, *keys):
+    for key in keys:
+        if d.get(key):
+            return d[key]
+    return None
+
+
+def _intent_items(payload):
+    body = payload.get("graph") if isinstance(payload.get("graph"), dict) else payload
+    items = _first(body, "intents", "nodes", "results") or []
+    return [item if isinstance(item, dict) else {"intent": str(item)} for item in items]
+
+
+def _assistant_answers(item):
+    answers = _first(item, "assistants", "answers", "results") or []
+    if isinstance(answers, dict):
+        return [(name, a if isinstance(a, dict) else {"response": a}) for name, a in answers.items()]
+    return [(a.get("assistant") or a.get("name") or "assistant", a) for a in answers if isinstance(a, dict)]
+
+
+def _sources(answer):
+    sources = _first(answer, "sources", "citations", "cited_sources") or []
+    labels = []
+    for src in sources:
+        if isinstance(src, dict):
+            src = src.get("url") or src.get("domain") or src.get("title")
+        if src:
+            labels.append(str(src))
+    return labels
+
+
+class CompactGraph:
+    def __init__(self):
+        self.kinds = []
+        self.labels = []
+        self.details = []
+        self.edges = []  # (src, dst, cited)
+        self._ids = {}
+        self._edge_ids = set()
+        self._dot = None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add_node(self, kind, label, detail=None, shared=True):
+        key = (kind, label)
+        if shared and key in self._ids:
+            return self._ids[key]
+        node_id = len(self.kinds)
+        self.kinds.append(kind)
+        self.labels.append(label)
+        self.details.append(detail)
+        if shared:
+            self._ids[key] = node_id
+        return node_id
+
+    def add_edge(self, src, dst, cited=None):
+        # Shared nodes (assistants, sources) are reached from many intents;
+        # unlabelled edges between them are only drawn once.
+        if cited is None:
+            if (src, dst) in self._edge_ids:
+                return
+            self._edge_ids.add((src, dst))
+        self.edges.append((src, dst, cited))
+
+    @classmethod
+    def from_payload(cls, payload, domain=None):
+        g = cls()
+        body = payload.get("graph") if isinstance(payload.get("graph"), dict) else payload
+        root = g.add_node(DOMAIN, domain or body.get("domain") or payload.get("domain") or "domain")
+        for item in _intent_items(payload):
+            label = _first(item, "intent", "query", "name", "label") or "intent"
+            intent = g.add_node(INTENT, str(label), detail=item, shared=False)
+            g.add_edge(root, intent)
+            for name, answer in _assistant_answers(item):
+                assistant = g.add_node(ASSISTANT, str(name))
+                g.add_edge(intent, assistant, cited=answer.get("cited"))
+                for src in _sources(answer):
+                    g.add_edge(assistant, g.add_node(SOURCE, src))
+        return g
+
+    def counts(self):
+        counts = {}
+        for kind in self.kinds:
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+    def nodes_of(self, kind):
+        return [i for i, k in enumerate(self.kinds) if k == kind]
+
+    def to_dot(self):
+        if self._dot is None:
+            lines = ["digraph G {", "rankdir=LR;", "node [fontname=Helvetica];"]
+            for i, (kind, label) in enumerate(zip(self.kinds, self.labels)):
+                lines.append(f"n{i} [label={json.dumps(label[:60])} {NODE_STYLES[kind]}];")
+            for src, dst, cited in self.edges:
+                if cited is None:
+                    lines.append(f"n{src} -> n{dst};")
+                else:
+                    color = "#2E9E4F" if cited else "#C8423B"
+                    lines.append(f'n{src} -> n{dst} [color="{color}" label="{"cited" if cited else "not cited"}" fontsize=9];')
+            lines.append("}")
+            self._dot = "\n".join(lines)
+        return self._dot
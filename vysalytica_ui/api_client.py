@@ -0,0 +1,525 @@
+"""Shared HTTP client for the Vysalytica API.
+
+One pooled ``requests.Session`` per process, health-checked backends behind a
+circuit breaker (see ``health``), retries with backoff for 429/5xx,
+per-endpoint timeouts, a TTL cache for read-only endpoints, a persistent store
+of finished audits, single-flight coalescing of identical expensive POSTs,
+per-key quota scheduling of audits and a single place that unwraps the
+``{success, data, error}`` envelope returned by every endpoint.
+"""
+import os
+import random
+import time
+import uuid
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+from urllib3.exceptions import NewConnectionError
+from urllib3.util import make_headers
+
+from .cache import ResponseCache
+from .health import FAILURE_STATUSES, BackendPool, parse_base_urls
+from .metrics import Metrics, get_metrics
+from .payloads import loads, trim
+from .quota import INTERACTIVE, QueueCancelled, QuotaRequeued, QuotaScheduler, Ticket
+from .singleflight import SingleFlight, flight_key
+from .store import DEFAULT_FRESHNESS, DEFAULT_PATH, AuditStore
+from .streaming import NDJSON, SSE, STREAM_ACCEPT, AuditStream, StreamError, iter_events
+
+DEFAULT_API_BASE = "https://vysalytica-api.onrender.com"
+
+# Seconds. Crawls and LLM-backed endpoints get the long timeout, everything
+# else is a cheap read.
+DEFAULT_TIMEOUT = 30
+ENDPOINT_TIMEOUTS = {
+    "/api/audit": 120,
+    "/api/citations/track": 120,
+    "/api/answer_graph/build": 120,
+    "/api/playbooks/generate": 120,
+    "/api/report/playbook_md": 60,
+    "/api/report/playbook_docx": 60,
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Expensive POSTs where concurrent identical requests share one upstream call
+COALESCED_ROUTES = {"/api/audit", "/api/citations/track", "/api/answer_graph/build", "/api/playbooks/generate"}
+
+
+class ApiError(Exception):
+    """Raised for transport failures, non-200 responses and ``success: false``."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+    def __str__(self):
+        if self.status_code is not None:
+            return f"API Error: {self.status_code} - {self.message}"
+        return self.message
+
+
+class BackendUnavailable(ApiError):
+    """Every backend's circuit is open or the backend is cold-starting; nothing was sent."""
+
+
+def _never_sent(error):
+    """True if a ``ConnectionError`` happened before the request reached the server.
+
+    Resets and aborts on an open (e.g. stale keep-alive) connection may come
+    after the body was sent, so only connect-phase failures are safe to replay.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class ApiClient:
+    def __init__(self, base_url=DEFAULT_API_BASE, pool_size=10, max_retries=3,
+                 backoff_factor=0.5, backoff_max=10.0, timeouts=None, cache=None, metrics=None, store=None,
+                 quota=None, backends=None):
+        """``base_url`` may be a comma-separated list; see ``health.BackendPool``."""
+        self.backends = backends if backends is not None else BackendPool(parse_base_urls(base_url), interval=0)
+        self.base_url = self.backends.backends[0].url
+        self.cache = cache if cache is not None else ResponseCache()
+        self.store = store
+        self.flights = SingleFlight()
+        self.quota = quota if quota is not None else QuotaScheduler()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeouts = dict(ENDPOINT_TIMEOUTS, **(timeouts or {}))
+
+        self.session = requests.Session()
+        # Retries are handled in _send so that POSTs are only replayed on 429
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # gzip/deflate always; br and zstd when brotli/zstandard are installed
+        self.session.headers.update(make_headers(accept_encoding=True))
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+    def _timeout_for(self, path):
+        return self.timeouts.get(path, DEFAULT_TIMEOUT)
+
+    @staticmethod
+    def _retry_after(resp):
+        value = resp.headers.get("Retry-After", "")
+        return float(value) if value.isdigit() else None
+
+    def _backoff(self, attempt, resp=None):
+        retry_after = self._retry_after(resp) if resp is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_factor * (2 ** attempt), self.backoff_max)
+        return delay + random.uniform(0, delay)
+
+    def _send(self, method, path, *, params=None, json=None, api_key=None, timeout=None, route=None,
+              stream=False, accept=None):
+        """Send a request, retrying on connection errors, 429 and 5xx.
+
+        POSTs start expensive upstream work, so they are only retried when the
+        server rejected them outright (429) or the connection never opened.
+        A 429 on a keyed call is returned straight away instead: the caller
+        puts it back in the key's quota queue (see ``_send_audit``).
+        Every call is recorded in ``self.metrics`` under ``route``; for
+        ``stream=True`` the latency is time to response headers and the caller
+        records bytes in once the body is read.
+        """
+        request_id = uuid.uuid4().hex
+        headers = {"X-Request-ID": request_id}
+        if accept:
+            headers["Accept"] = accept
+        if api_key:
+            headers["X-API-Key"] = api_key
+        timeout = timeout or self._timeout_for(path)
+        idempotent = method == "GET"
+        started = time.perf_counter()
+        resp = None
+        retries = 0
+        error = None
+        failed = None  # backend that just failed, so a retry prefers another one
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                last = attempt == self.max_retries
+                retries = attempt
+                backend = self.backends.select(exclude=failed)
+                failed = None
+                if backend is None:
+                    error = "unavailable"
+                    raise BackendUnavailable(self.backends.unavailable_reason())
+                try:
+                    resp = self.session.request(method, f"{backend.url}{path}", params=params, json=json,
+                                                headers=headers, timeout=timeout, stream=stream)
+                except requests.ConnectionError as e:
+                    self.backends.record_failure(backend, "connection")
+                    failed = backend
+                    if last or not (idempotent or _never_sent(e)):
+                        error = "connection"
+                        raise ApiError(f"Connection failed: {e}") from e
+                    time.sleep(self._backoff(attempt))
+                    continue
+                except requests.Timeout as e:
+                    self.backends.record_failure(backend, "timeout")
+                    failed = backend
+                    if last or not idempotent:
+                        error = "timeout"
+                        raise ApiError(f"Request timed out after {timeout}s") from e
+                    time.sleep(self._backoff(attempt))
+                    continue
+
+                if resp.status_code in FAILURE_STATUSES:
+                    self.backends.record_failure(backend, f"HTTP {resp.status_code}")
+                    failed = backend
+                else:
+                    self.backends.record_success(backend)
+                if resp.status_code == 429 and api_key:
+                    return resp
+                retryable = resp.status_code == 429 or (idempotent and resp.status_code in RETRY_STATUSES)
+                if retryable and not last:
+                    resp.close()
+                    time.sleep(self._backoff(attempt, resp))
+                    continue
+                return resp
+        finally:
+            body = resp.request.body if resp is not None else None
+            if resp is None or error is not None:
+                bytes_in = 0
+            elif stream:
+                bytes_in = 0  # chunked, so counted after the body is read
+            else:
+                # Content-Length is the on-the-wire (compressed) size
+                bytes_in = int(resp.headers.get("Content-Length") or len(resp.content))
+            self.metrics.record_request(
+                route or path, method,
+                status=resp.status_code if resp is not None and error is None else None,
+                seconds=time.perf_counter() - started,
+                bytes_out=len(body) if body else 0,
+                bytes_in=bytes_in,
+                retries=retries,
+                error=error,
+                request_id=request_id,
+            )
+
+    @staticmethod
+    def _unwrap(resp, route=None):
+        """Decode the envelope and return ``data``, trimmed for ``route``."""
+        if resp.status_code != 200:
+            raise ApiError(resp.text[:300], status_code=resp.status_code)
+        try:
+            data = loads(resp.content)
+        except ValueError as e:
+            raise ApiError("Invalid JSON in API response", status_code=resp.status_code) from e
+        if not data.get("success"):
+            raise ApiError(data.get("error") or "Unknown error")
+        return trim(route, data.get("data"))
+
+    def get(self, path, params=None, api_key=None, route=None):
+        """GET ``path``; responses for cacheable routes are served from the cache.
+
+        ``route`` is the path template used for TTL lookup and invalidation
+        (defaults to ``path``).
+        """
+        route = route or path
+        cacheable = self.cache.cacheable(route) and not api_key
+        if cacheable:
+            hit, value = self.cache.get(path, params)
+            self.metrics.record_cache(route, hit)
+            if hit:
+                return value
+        resp = self._send("GET", path, params=params, api_key=api_key, route=route)
+        value = self._unwrap(resp, route)
+        if cacheable:
+            self.cache.set(route, path, params, value, len(resp.content))
+        return value
+
+    def _coalesce(self, path, payload, api_key, fn, context=None, on_wait=None, on_join=None, ticket=None):
+        """Run ``fn()``, sharing one call between concurrent identical requests.
+
+        If the shared call was cancelled or sent back to its job gate while
+        waiting for quota, and this caller's own ``ticket`` was not, the
+        caller runs the call itself.
+        """
+        if path not in COALESCED_ROUTES:
+            return fn()
+        key = flight_key(path, payload, api_key)
+        while True:
+            try:
+                value, shared = self.flights.do(key, fn, context=context, on_wait=on_wait, on_join=on_join)
+            except QueueCancelled:
+                if ticket is None or ticket.cancelled:
+                    raise
+                continue
+            except QuotaRequeued as e:
+                if e.ticket is ticket:
+                    raise
+                continue
+            if shared:
+                self.metrics.record_coalesced(path)
+                if ticket is not None:
+                    self.quota.refund(ticket)
+            return value
+
+    def _join_audit(self, priority):
+        # A caller joining a queued audit lifts it to its own priority
+        return lambda leader: self.quota.promote(leader["ticket"], priority)
+
+    def post(self, path, payload, api_key=None):
+        return self._coalesce(path, payload, api_key,
+                              lambda: self._unwrap(self._send("POST", path, json=payload, api_key=api_key), path))
+
+    def post_raw(self, path, payload, api_key=None):
+        """POST and return the raw response body (file downloads)."""
+        resp = self._send("POST", path, json=payload, api_key=api_key)
+        if resp.status_code != 200:
+            raise ApiError(resp.text[:300], status_code=resp.status_code)
+        return resp.content
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    def _invalidate_history(self, url):
+        host = urlparse(url).netloc.lower()
+        self.cache.invalidate("/api/audit/history",
+                              lambda p: not p.get("domain") or p["domain"].lower() in host)
+
+    def _stored_audit(self, url, plan, packs, api_key, force_refresh):
+        if self.store is None or force_refresh:
+            return None
+        result = self.store.lookup(url, plan, packs, api_key)
+        self.metrics.record_cache("/api/audit (store)", result is not None)
+        return result
+
+    def _save_audit(self, result, url, plan, packs, api_key):
+        if self.store is not None:
+            self.store.save(result, url, plan, packs, api_key)
+
+    def _acquire_quota(self, api_key, priority, ticket):
+        """Wait for ``api_key``'s quota; quotas of unknown keys are looked up once via the key list.
+
+        ``API_QUOTA_PER_HOUR`` applies only if the lookup fails or misses the key.
+        """
+        if not api_key or (ticket is not None and ticket.granted_at is not None):
+            return  # keyless, or already granted by reserve_quota
+        if not self.quota.knows(api_key):
+            try:
+                self.quota.register_keys(self.list_keys())
+            except ApiError:
+                pass
+            self.quota.looked_up(api_key)
+        self.quota.acquire(api_key, priority, ticket)
+
+    def reserve_quota(self, url, plan, packs, api_key=None, force_refresh=False, priority=INTERACTIVE, ticket=None):
+        """Wait for quota ahead of ``run_audit``/``stream_audit`` called with the same ``ticket``.
+
+        Used as a job gate, so an audit over its key's quota queues without
+        holding a job worker. Returns at once for keyless audits and audits
+        the store can answer; a reserved token that ends up unused (stored or
+        coalesced result) is refunded.
+        """
+        if not api_key or ticket is None:
+            return
+        ticket.gated = True
+        if self.store is not None and not force_refresh and self.store.lookup(url, plan, packs, api_key) is not None:
+            return
+        self._acquire_quota(api_key, priority, ticket)
+
+    def run_audit(self, url, plan, packs, api_key=None, force_refresh=False, priority=INTERACTIVE, ticket=None):
+        """Run an audit, or return a stored result for the same audit within the freshness window.
+
+        Stored results carry ``stored_at`` (epoch seconds). Keyed audits wait
+        in the quota queue at ``priority``; pass a ``quota.Ticket`` to watch
+        the queue position.
+        """
+        stored = self._stored_audit(url, plan, packs, api_key, force_refresh)
+        if stored is not None:
+            if ticket is not None:
+                self.quota.refund(ticket)
+            return stored
+        payload = {"url": url, "plan": plan, "packs": sorted(packs)}
+        ticket = ticket if ticket is not None else Ticket()
+
+        def call():
+            return self._unwrap(self._send_audit(payload, api_key, priority, ticket), "/api/audit")
+
+        result = self._coalesce("/api/audit", payload, api_key, call, context={"ticket": ticket},
+                                on_join=self._join_audit(priority), ticket=ticket)
+        self._invalidate_history(url)
+        self._save_audit(result, url, plan, packs, api_key)
+        return result
+
+    def stream_audit(self, url, plan, packs, api_key=None, progress=None, force_refresh=False,
+                     priority=INTERACTIVE, ticket=None):
+        """Run an audit, applying NDJSON/SSE events to ``progress`` as they arrive.
+
+        Falls back to a regular JSON response when the server does not stream.
+        Returns the final result dict, like ``run_audit``, including its use of
+        the audit store.
+        """
+        progress = progress if progress is not None else AuditStream()
+        stored = self._stored_audit(url, plan, packs, api_key, force_refresh)
+        if stored is not None:
+            if ticket is not None:
+                self.quota.refund(ticket)
+            progress.load_result(stored)
+            return progress.result()
+        payload = {"url": url, "plan": plan, "packs": sorted(packs)}
+        ticket = ticket if ticket is not None else Ticket()
+        # A session joining an identical in-flight audit mirrors the leader's progress
+        result = self._coalesce("/api/audit", payload, api_key,
+                                lambda: self._stream_audit(payload, api_key, progress, priority, ticket),
+                                context={"progress": progress, "ticket": ticket},
+                                on_wait=lambda leader: progress.mirror(leader.get("progress")),
+                                on_join=self._join_audit(priority), ticket=ticket)
+        if not progress.done:
+            progress.load_result(result)
+        self._invalidate_history(url)
+        self._save_audit(result, url, plan, packs, api_key)
+        return result
+
+    def _send_audit(self, payload, api_key, priority, ticket, **kwargs):
+        """POST an audit once the key's quota allows; a 429 puts a keyed audit back in the queue."""
+        requeues = 0
+        while True:
+            self._acquire_quota(api_key, priority, ticket)
+            resp = self._send("POST", "/api/audit", json=payload, api_key=api_key, **kwargs)
+            if resp.status_code != 429 or not api_key:
+                return resp
+            resp.close()
+            # Over quota upstream: hold every call for this key for the full Retry-After
+            retry_after = self._retry_after(resp)
+            self.quota.pause(api_key, retry_after if retry_after is not None else self._backoff(requeues))
+            requeues += 1
+            ticket.requeue()
+            if ticket.gated:
+                raise QuotaRequeued(ticket)  # wait in the job's gate, not in a job worker
+
+    def _stream_audit(self, payload, api_key, progress, priority, ticket):
+        resp = self._send_audit(payload, api_key, priority, ticket, stream=True, accept=STREAM_ACCEPT)
+        read = {"bytes": 0}
+        with resp:
+            content_type = resp.headers.get("Content-Type", "")
+            try:
+                if resp.status_code == 200 and (NDJSON in content_type or SSE in content_type):
+                    try:
+                        for event, data in iter_events(resp, read):
+                            progress.apply(event, data)
+                    except StreamError as e:
+                        raise ApiError(str(e)) from e
+                    except (ValueError, requests.RequestException) as e:
+                        raise ApiError(f"Audit stream interrupted: {e}") from e
+                    if not progress.done:
+                        raise ApiError("Audit stream ended before the audit finished")
+                else:
+                    read["bytes"] = int(resp.headers.get("Content-Length") or len(resp.content))
+                    progress.load_result(self._unwrap(resp, "/api/audit"))
+            finally:
+                self.metrics.record_bytes_in("/api/audit", read["bytes"])
+        return progress.result()
+
+    def get_audit(self, audit_id):
+        """Audit details: from the response cache, else the audit store, else the API.
+
+        The cache is checked first so repeat reads don't re-query and
+        re-decode the stored blob.
+        """
+        route = "/api/audit/{id}"
+        path = f"/api/audit/{audit_id}"
+        hit, result = self.cache.get(path)
+        self.metrics.record_cache(route, hit)
+        if hit:
+            return result
+        if self.store is not None:
+            stored = self.store.get(audit_id)
+            self.metrics.record_cache("/api/audit/{id} (store)", stored is not None)
+            if stored is not None:
+                return stored
+        resp = self._send("GET", path, route=route)
+        result = self._unwrap(resp, route)
+        self.cache.set(route, path, None, result, len(resp.content))
+        if self.store is not None and isinstance(result, dict):
+            self.store.save(dict(result, audit_id=result.get("audit_id", audit_id)))
+        return result
+
+    def audit_history(self, limit=10, domain=None, offset=0):
+        params = {"limit": limit}
+        if offset:
+            params["offset"] = offset
+        if domain:
+            params["domain"] = domain
+        return self.get("/api/audit/history", params=params)
+
+    def track_citations(self, brand, intent, assistants):
+        result = self.post("/api/citations/track", {"brand": brand, "intent": intent, "assistants": assistants})
+        self.cache.invalidate("/api/citations/stats", lambda p: p.get("brand") == brand)
+        return result
+
+    def citation_stats(self, brand):
+        return self.get("/api/citations/stats", params={"brand": brand})
+
+    def build_answer_graph(self, domain, intents, packs):
+        result = self.post("/api/answer_graph/build", {"domain": domain, "intents": intents, "packs": packs})
+        self.cache.invalidate("/api/answer_graph/", lambda p: p.get("domain") == domain)
+        return result
+
+    def list_answer_graphs(self, domain, limit=5, offset=0):
+        params = {"domain": domain, "limit": limit}
+        if offset:
+            params["offset"] = offset
+        return self.get("/api/answer_graph/", params=params)
+
+    def generate_playbook(self, domain, intent, target_assistant):
+        payload = {"domain": domain, "intent": intent, "target_assistant": target_assistant}
+        return self.post("/api/playbooks/generate", payload)
+
+    def playbook_markdown(self, playbook):
+        return self.post_raw("/api/report/playbook_md", {"playbook": playbook})
+
+    def playbook_docx(self, playbook):
+        return self.post_raw("/api/report/playbook_docx", {"playbook": playbook})
+
+    def create_key(self, name, quota_per_hour):
+        result = self.post("/api/keys/create", {"name": name, "quota_per_hour": quota_per_hour})
+        self.cache.invalidate("/api/keys/list")
+        if isinstance(result, dict) and result.get("key"):
+            self.quota.set_quota(result["key"], quota_per_hour)
+        return result
+
+    def list_keys(self):
+        return self.get("/api/keys/list")
+
+    def plans(self):
+        return self.get("/api/plans")
+
+    def compare_plans(self):
+        return self.get("/api/plans/compare")
+
+
+@st.cache_resource
+def get_client():
+    """Process-wide client shared by every session and tab."""
+    urls = parse_base_urls(os.getenv("API_BASE") or DEFAULT_API_BASE)
+    return ApiClient(
+        backends=BackendPool(urls, interval=float(os.getenv("API_PROBE_INTERVAL", "60"))).start(),
+        pool_size=int(os.getenv("API_POOL_SIZE", "10")),
+        max_retries=int(os.getenv("API_MAX_RETRIES", "3")),
+        cache=ResponseCache(
+            max_entries=int(os.getenv("API_CACHE_MAX_ENTRIES", "512")),
+            max_bytes=int(os.getenv("API_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        ),
+        metrics=get_metrics(),
+        quota=QuotaScheduler(default_quota=int(os.getenv("API_QUOTA_PER_HOUR", "0")) or None),
+        store=AuditStore(
+            path=os.getenv("AUDIT_STORE_PATH", DEFAULT_PATH),
+            freshness=int(os.getenv("AUDIT_FRESHNESS_SECONDS", str(DEFAULT_FRESHNESS))),
+        ),
+    )
@@ -0,0 +1,145 @@
+"""Bulk audits: many URLs fanned out to ``/api/audit`` on a bounded pool.
+
+A ``BulkAuditRun`` lives in the process-wide run registry so that the results
+table survives reruns; the session only keeps the run ID. Cancelling stops queued
+URLs (in-flight audits are allowed to finish) and ``start()`` on a cancelled
+run resumes with whatever has not completed yet. Bulk audits wait for API quota
+behind interactive audits on the same key.
+"""
+import csv
+import io
+import json
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from .quota import BULK, QueueCancelled, Ticket
+
+QUEUED = "queued"
+WAITING = "waiting for quota"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+RESULT_COLUMNS = ["url", "status", "overall_score", "page_count", "audit_id", "error"]
+
+
+def parse_url_list(data, filename=""):
+    """Extract URLs from an uploaded CSV or sitemap.xml, de-duplicated in order."""
+    text = data.decode("utf-8-sig", errors="replace")
+    if filename.lower().endswith(".xml") or text.lstrip().startswith("<"):
+        root = ET.fromstring(text)
+        urls = [el.text.strip() for el in root.iter() if el.tag.rsplit("}", 1)[-1] == "loc" and el.text]
+    else:
+        rows = list(csv.reader(io.StringIO(text)))
+        col = 0
+        if rows:
+            header = [h.strip().lower() for h in rows[0]]
+            if "url" in header:
+                col = header.index("url")
+                rows = rows[1:]
+        urls = [r[col].strip() for r in rows if len(r) > col]
+    return list(dict.fromkeys(u for u in urls if u.startswith("http")))
+
+
+class BulkAuditRun:
+    def __init__(self, client, urls, plan, packs, api_key=None, concurrency=4):
+        self.id = uuid.uuid4().hex[:12]
+        self.client = client
+        self.urls = urls
+        self.plan = plan
+        self.packs = packs
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.created_at = time.time()
+        self.rows = {u: {"url": u, "status": QUEUED, "overall_score": None, "page_count": None,
+                         "audit_id": None, "error": None} for u in urls}
+        self._cancel = threading.Event()
+        self._executor = None
+        self._futures = []
+        self._tickets = {}  # url -> quota Ticket while the audit is in progress
+
+    @property
+    def running(self):
+        return any(not f.done() for f in self._futures)
+
+    def counts(self):
+        counts = {}
+        for row in self.table():
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+        return counts
+
+    def start(self):
+        """Start the run, or resume it with every URL that has not completed."""
+        if self.running:
+            return
+        self._cancel.clear()
+        pending = [u for u in self.urls if self.rows[u]["status"] != DONE]
+        for url in pending:
+            self.rows[url].update(status=QUEUED, error=None)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="vys-bulk")
+        self._futures = [self._executor.submit(self._audit, url) for url in pending]
+        self._executor.shutdown(wait=False)
+
+    def cancel(self):
+        self._cancel.set()
+        for future in self._futures:
+            future.cancel()
+        for ticket in list(self._tickets.values()):
+            if ticket.waiting:
+                self.client.quota.cancel(ticket)
+        for row in self.rows.values():
+            if row["status"] == QUEUED:
+                row["status"] = CANCELLED
+
+    def _audit(self, url):
+        row = self.rows[url]
+        if self._cancel.is_set():
+            row["status"] = CANCELLED
+            return
+        row["status"] = RUNNING
+        ticket = self._tickets[url] = Ticket()
+        try:
+            result = self.client.run_audit(url, self.plan, self.packs, api_key=self.api_key,
+                                           priority=BULK, ticket=ticket)
+        except QueueCancelled:
+            row["status"] = CANCELLED
+            return
+        except Exception as e:
+            row.update(status=ERROR, error=str(e))
+            return
+        finally:
+            self._tickets.pop(url, None)
+        row.update(
+            status=DONE,
+            overall_score=int(result.get("scores", {}).get("overall", 0)),
+            page_count=result.get("page_count", 0),
+            audit_id=result.get("audit_id"),
+        )
+
+    def quota_wait(self):
+        """``(audits waiting for quota, earliest estimated start)``, or ``(0, None)``."""
+        waiting = [t for t in list(self._tickets.values()) if t.waiting]
+        etas = [eta for eta in (self.client.quota.eta(t) for t in waiting) if eta is not None]
+        return len(waiting), min(etas, default=None)
+
+    def table(self):
+        rows = [dict(row) for row in self.rows.values()]
+        for row in rows:
+            ticket = self._tickets.get(row["url"])
+            if row["status"] == RUNNING and ticket is not None and ticket.waiting:
+                row["status"] = WAITING
+        return rows
+
+    def to_csv(self):
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(self.table())
+        return buf.getvalue()
+
+    def to_jsonl(self):
+        return "".join(json.dumps(row) + "\n" for row in self.table())
@@ -0,0 +1,95 @@
+"""Process-wide TTL + LRU cache for read-only API responses.
+
+Entries are keyed by request path and query params. Each route template
+(``/api/audit/{id}``) has its own TTL, where ``None`` means the entry never
+expires (a finished audit never changes), and the cache as a whole is bounded
+by entry count and approximate payload bytes.
+Cached values are shared between sessions and must be treated as read-only.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+HOUR = 3600
+
+# Route template -> TTL in seconds. Routes not listed here are never cached.
+ROUTE_TTLS = {
+    "/api/plans": 6 * HOUR,
+    "/api/plans/compare": 6 * HOUR,
+    "/api/audit/{id}": None,
+    "/api/audit/history": 15,
+    "/api/citations/stats": 60,
+    "/api/answer_graph/": 60,
+    "/api/keys/list": 30,
+}
+
+
+def make_key(path, params=None):
+    return (path, tuple(sorted((params or {}).items())))
+
+
+class ResponseCache:
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024, ttls=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(ROUTE_TTLS, **(ttls or {}))
+        self._entries = OrderedDict()  # key -> (route, value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, route):
+        return route in self.ttls
+
+    def get(self, path, params=None):
+        """Return ``(True, value)`` on a fresh hit, ``(False, None)`` otherwise."""
+        key = make_key(path, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            _, value, _, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, route, path, params, value, size):
+        if not self.cacheable(route) or size > self.max_bytes:
+            return
+        ttl = self.ttls[route]
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        key = make_key(path, params)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (route, value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, route, match=None):
+        """Drop entries for ``route``; ``match(params_dict)`` narrows the set."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e[0] == route]:
+                if match is None or match(dict(key[1])):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+    def _drop(self, key):
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
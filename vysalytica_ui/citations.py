@@ -0,0 +1,64 @@
+"""Citation sweeps: one brand tracked across many intents and assistants.
+
+Every (intent, assistant) pair is its own ``/api/citations/track`` call, run on
+a bounded pool, so a slow assistant only delays its own rows and the sweep as
+a whole takes roughly as long as the slowest single call.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = "pending"
+DONE = "done"
+ERROR = "error"
+
+EXCERPT_CHARS = 500
+
+
+class CitationSweep:
+    def __init__(self, client, brand, intents, assistants, concurrency=8):
+        self.id = uuid.uuid4().hex[:12]
+        self.client = client
+        self.brand = brand
+        self.concurrency = concurrency
+        self.created_at = time.time()
+        self.rows = [{"intent": intent, "assistant": assistant, "status": PENDING, "cited": None,
+                      "excerpt": "", "error": None}
+                     for intent in intents for assistant in assistants]
+        self._lock = threading.Lock()
+        self._futures = []
+
+    @property
+    def running(self):
+        return any(not f.done() for f in self._futures)
+
+    def start(self):
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="vys-cite")
+        self._futures = [executor.submit(self._track, row) for row in self.rows]
+        executor.shutdown(wait=False)
+
+    def _track(self, row):
+        try:
+            data = self.client.track_citations(self.brand, row["intent"], [row["assistant"]])
+            result = next((r for r in data.get("results", []) if r.get("assistant") == row["assistant"]), {})
+        except Exception as e:
+            with self._lock:
+                row.update(status=ERROR, error=str(e))
+            return
+        with self._lock:
+            row.update(status=DONE, cited=bool(result.get("cited")),
+                       excerpt=(result.get("response") or "")[:EXCERPT_CHARS])
+
+    def summary(self):
+        """Aggregate over the pairs completed so far."""
+        with self._lock:
+            done = [r for r in self.rows if r["status"] == DONE]
+            cited = sum(1 for r in done if r["cited"])
+            errors = sum(1 for r in self.rows if r["status"] == ERROR)
+        rate = round(100 * cited / len(done), 1) if done else 0.0
+        return {"rate": rate, "cited": cited, "total": len(done), "errors": errors, "pairs": len(self.rows)}
+
+    def table(self):
+        with self._lock:
+            return [dict(row) for row in self.rows]
@@ -0,0 +1,137 @@
+"""Audit-to-audit finding diffs and per-domain score trends.
+
+Findings are matched by identity (rule plus the page it was found on) with a
+hash join on a key column, so comparing audits with thousands of findings is
+a single ``merge`` instead of nested loops, and then classified by how their
+status changed. Score trends are aggregated from
+audit history pages with vectorized pandas/NumPy operations.
+"""
+import numpy as np
+import pandas as pd
+
+DIFF_COLUMNS = ["title", "category", "status", "evidence"]
+PASS = "pass"
+
+
+def finding_key(finding):
+    """Identity of a finding across audits: its rule, and the page it was found on if given.
+
+    A generic ``id`` may be a per-audit row ID and ``evidence`` is free text
+    that changes between runs, so neither is used.
+    """
+    rule = finding.get("rule_id") or f"{finding.get('category', '')}:{finding.get('title', '')}"
+    return f"{rule}|{finding['url']}" if finding.get("url") else rule
+
+
+def findings_frame(findings):
+    df = pd.DataFrame(
+        [{col: str(f.get(col) or "") for col in DIFF_COLUMNS} for f in findings],
+        columns=DIFF_COLUMNS,
+    )
+    # The same rule can fire more than once on a page; number repeats so they pair up in order
+    seen = {}
+    keys = []
+    for f in findings:
+        key = finding_key(f)
+        seen[key] = seen.get(key, 0) + 1
+        keys.append(f"{key}#{seen[key]}")
+    df.insert(0, "key", keys)
+    return df
+
+
+def is_issue(status):
+    """Mask of statuses that are open issues (present and not ``pass``)."""
+    return status.notna() & (status.fillna(PASS).str.lower() != PASS)
+
+
+class AuditDiff:
+    """Findings of two audits matched by identity and classified by status.
+
+    ``added`` holds new issues and regressions (pass -> not pass),
+    ``resolved`` holds issues that passed or disappeared, and ``unchanged``
+    the rest of the findings present in both audits.
+    """
+
+    def __init__(self, old, new):
+        self.old_id = old.get("audit_id")
+        self.new_id = new.get("audit_id")
+        self.old_score = (old.get("scores") or {}).get("overall")
+        self.new_score = (new.get("scores") or {}).get("overall")
+        merged = findings_frame(old.get("findings", [])).merge(
+            findings_frame(new.get("findings", [])), on="key", how="outer", suffixes=("_old", "_new"), indicator=True,
+        )
+        # Latest version of each finding; status is "" once it is no longer reported
+        view = pd.DataFrame({col: merged[f"{col}_new"].fillna(merged[f"{col}_old"]) for col in DIFF_COLUMNS})
+        view["status"] = merged["status_new"].fillna("")
+        view.insert(3, "previous_status", merged["status_old"].fillna(""))
+        old_issue = is_issue(merged["status_old"])
+        new_issue = is_issue(merged["status_new"])
+        added = new_issue & ~old_issue
+        resolved = old_issue & ~new_issue
+        unchanged = (merged["_merge"] == "both") & ~added & ~resolved
+        self.added = view[added].reset_index(drop=True)
+        self.resolved = view[resolved].reset_index(drop=True)
+        self.unchanged = view[unchanged].reset_index(drop=True)
+        self.status_changed = int((self.unchanged["status"] != self.unchanged["previous_status"]).sum())
+
+    @property
+    def score_delta(self):
+        if self.old_score is None or self.new_score is None:
+            return None
+        return self.new_score - self.old_score
+
+    def counts(self):
+        return {"added": len(self.added), "resolved": len(self.resolved), "unchanged": len(self.unchanged),
+                "status_changed": self.status_changed}
+
+
+class ScoreTrend:
+    """A domain's ``overall_score`` over time, built from history pages as they are loaded.
+
+    ``pager`` is an ``OffsetPager`` over ``/api/audit/history`` for the domain;
+    each page is converted to a frame once and appended.
+    """
+
+    def __init__(self, pager):
+        self.pager = pager
+        self._frames = []
+        self._pages_seen = 0
+        self.df = pd.DataFrame(columns=["id", "created_at", "overall_score"])
+
+    def load_more(self, pages=1):
+        """Fetch up to ``pages`` more history pages; returns False once history is exhausted."""
+        for _ in range(pages):
+            if self._pages_seen and not self.pager.has_next(self._pages_seen):
+                return False
+            rows = self.pager.get_page(self._pages_seen + 1)
+            self._pages_seen += 1
+            frame = pd.DataFrame(rows, columns=["id", "created_at", "overall_score"])
+            frame["created_at"] = pd.to_datetime(frame["created_at"], utc=True, errors="coerce")
+            frame["overall_score"] = pd.to_numeric(frame["overall_score"], errors="coerce")
+            self._frames.append(frame.dropna(subset=["created_at", "overall_score"]))
+        self.df = pd.concat(self._frames, ignore_index=True).drop_duplicates("id").sort_values("created_at")
+        return self.pager.has_next(self._pages_seen)
+
+    @property
+    def exhausted(self):
+        return bool(self._pages_seen) and not self.pager.has_next(self._pages_seen)
+
+    def daily(self, window=7):
+        """Per-day mean/min/max score, audit count and a ``window``-day rolling mean."""
+        if self.df.empty:
+            return pd.DataFrame(columns=["mean", "min", "max", "audits", "rolling_mean"])
+        daily = self.df.set_index("created_at")["overall_score"].resample("D").agg(["mean", "min", "max", "count"])
+        daily = daily.rename(columns={"count": "audits"})
+        daily = daily[daily["audits"] > 0]
+        daily["rolling_mean"] = daily["mean"].rolling(window, min_periods=1).mean()
+        return daily
+
+    def slope_per_week(self):
+        """Least-squares score change per week, or None with fewer than two audits."""
+        if len(self.df) < 2:
+            return None
+        days = (self.df["created_at"] - self.df["created_at"].min()).dt.total_seconds().to_numpy() / 86400
+        if np.ptp(days) == 0:
+            return None
+        slope = np.polyfit(days, self.df["overall_score"].to_numpy(dtype=float), 1)[0]
+        return float(slope * 7)
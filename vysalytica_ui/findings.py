@@ -0,0 +1,43 @@
+"""Index over an audit's findings for filtering, search and paging.
+
+Built once per audit result and kept in session memory, so changing a filter
+or page only slices an existing DataFrame instead of re-walking the findings.
+"""
+import pandas as pd
+
+TABLE_COLUMNS = ["title", "category", "status", "why", "fix"]
+
+
+class FindingsIndex:
+    def __init__(self, findings):
+        self.findings = findings
+        self.df = pd.DataFrame(
+            [{col: str(f.get(col) or "") for col in TABLE_COLUMNS} for f in findings],
+            columns=TABLE_COLUMNS,
+        )
+        # Pre-lowered haystack for text search over title, why and fix
+        self._search = (self.df["title"] + "\n" + self.df["why"] + "\n" + self.df["fix"]).str.lower()
+        self.categories = sorted(c for c in self.df["category"].unique() if c)
+        self.statuses = sorted(s for s in self.df["status"].unique() if s)
+
+    def __len__(self):
+        return len(self.df)
+
+    def filter(self, categories=None, statuses=None, query=""):
+        """Return the filtered view; its index holds positions into ``findings``."""
+        mask = pd.Series(True, index=self.df.index)
+        if categories:
+            mask &= self.df["category"].isin(categories)
+        if statuses:
+            mask &= self.df["status"].isin(statuses)
+        if query:
+            mask &= self._search.str.contains(query.lower(), regex=False)
+        return self.df[mask]
+
+    @staticmethod
+    def page(view, page, page_size):
+        start = (page - 1) * page_size
+        return view.iloc[start:start + page_size]
+
+    def detail(self, position):
+        return self.findings[position]
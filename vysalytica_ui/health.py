@@ -0,0 +1,178 @@
+"""Backend health probing, keep-warm and circuit breaking.
+
+``API_BASE`` may list several base URLs. A background prober GETs ``/health``
+on each of them at process start and then every ``interval`` seconds, which
+also keeps a Render instance from idling into a cold start. Requests go to the
+available backend with the lowest probe latency.
+
+Each backend has a circuit breaker: consecutive connection failures, timeouts
+or 502/503/504 responses open it, and requests fail fast instead of waiting
+out their timeout. A probe that has not answered within ``WAKING_AFTER``
+seconds (a cold start in progress) does the same, reported as "waking up".
+The breaker closes again on the next successful probe.
+"""
+import threading
+import time
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 15
+WAKING_AFTER = 3.0
+LATENCY_ALPHA = 0.3
+FAILURE_STATUSES = {502, 503, 504}
+
+
+def parse_base_urls(value):
+    return [u.strip().rstrip("/") for u in value.split(",") if u.strip()]
+
+
+class Backend:
+    def __init__(self, url):
+        self.url = url
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.latency = None  # EWMA of probe round trips, seconds
+        self.last_ok = None
+        self.last_error = None
+        self.probe_started_at = None
+
+    @property
+    def waking(self):
+        """A probe is taking long enough that the backend is probably cold-starting."""
+        if self.probe_started_at is None or time.monotonic() - self.probe_started_at < WAKING_AFTER:
+            return False
+        # A slow probe of a backend that is up and answering is just a slow probe
+        return self.last_ok is None or self.state != CLOSED
+
+    def available(self):
+        if self.waking:
+            return False
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < COOLDOWN_SECONDS:
+                return False
+            self.state = HALF_OPEN  # let trial requests through; the next failure reopens it
+        return True
+
+
+class BackendPool:
+    def __init__(self, urls, interval=60.0, probe_timeout=60.0, session=None):
+        self.backends = [Backend(url) for url in urls]
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Selection and request outcomes
+    # ------------------------------------------------------------------
+    def select(self, exclude=None):
+        """Available backend with the lowest probe latency, or None."""
+        with self._lock:
+            candidates = [b for b in self.backends if b is not exclude and b.available()]
+            if not candidates and exclude is not None and exclude.available():
+                candidates = [exclude]
+            if not candidates:
+                return None
+            return min(candidates, key=lambda b: float("inf") if b.latency is None else b.latency)
+
+    def record_success(self, backend):
+        with self._lock:
+            backend.failures = 0
+            if backend.state != CLOSED:
+                backend.state = CLOSED
+                backend.opened_at = None
+
+    def record_failure(self, backend, error):
+        with self._lock:
+            backend.failures += 1
+            backend.last_error = error
+            if backend.state == HALF_OPEN or backend.failures >= FAILURE_THRESHOLD:
+                backend.state = OPEN
+                backend.opened_at = time.monotonic()
+        self._wake.set()  # probe right away so recovery is noticed quickly
+
+    def unavailable_reason(self):
+        """Message for requests that cannot be sent to any backend."""
+        with self._lock:
+            if any(b.waking for b in self.backends):
+                return "The API is waking up from idle - requests resume automatically in a few seconds"
+            waits = [COOLDOWN_SECONDS - (time.monotonic() - b.opened_at) for b in self.backends if b.opened_at]
+            retry = f" - retrying in {max(1, int(min(waits)))}s" if waits else ""
+            errors = "; ".join(f"{b.url}: {b.last_error}" for b in self.backends if b.last_error)
+            return f"Backend unavailable{retry}" + (f" ({errors})" if errors else "")
+
+    def healthy(self):
+        with self._lock:
+            return any(b.state == CLOSED and not b.waking for b in self.backends)
+
+    def status(self):
+        with self._lock:
+            now = time.monotonic()
+            return [{
+                "url": b.url,
+                "state": "waking" if b.waking else b.state,
+                "latency_ms": round(b.latency * 1000) if b.latency is not None else None,
+                "failures": b.failures,
+                "last_ok_s_ago": round(now - b.last_ok) if b.last_ok else None,
+                "last_error": b.last_error,
+            } for b in self.backends]
+
+    # ------------------------------------------------------------------
+    # Prober
+    # ------------------------------------------------------------------
+    def probe(self, backend):
+        backend.probe_started_at = time.monotonic()
+        try:
+            resp = self.session.get(f"{backend.url}/health", timeout=self.probe_timeout)
+            # Any non-5xx answer means the service is up, even without a /health route
+            ok = resp.status_code < 500
+            error = None if ok else f"HTTP {resp.status_code}"
+        except requests.RequestException as e:
+            ok, error = False, type(e).__name__
+        elapsed = time.monotonic() - backend.probe_started_at
+        with self._lock:
+            backend.probe_started_at = None
+            if ok:
+                backend.latency = elapsed if backend.latency is None else \
+                    LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * backend.latency
+                backend.last_ok = time.monotonic()
+                backend.last_error = None
+                backend.failures = 0
+                backend.state = CLOSED
+                backend.opened_at = None
+            else:
+                backend.last_error = error
+                backend.state = OPEN
+                backend.opened_at = time.monotonic()
+        return ok
+
+    def probe_all(self):
+        # Daemon threads: a probe hanging on a cold backend must not block shutdown
+        threads = [threading.Thread(target=self.probe, args=(b,), daemon=True, name="vys-probe")
+                   for b in self.backends]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _loop(self):
+        while True:
+            self.probe_all()
+            # Probe faster while something is down so recovery shows up quickly
+            self._wake.wait(self.interval if self.healthy() else min(self.interval, 5.0))
+            self._wake.clear()
+
+    def start(self):
+        """Start the daemon prober thread (idempotent)."""
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="vys-health-prober")
+            self._thread.start()
+        return self
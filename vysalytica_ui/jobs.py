@@ -0,0 +1,199 @@
+"""Background jobs for long-running API calls.
+
+Audits can take minutes. Instead of holding a Streamlit script thread inside
+the request, the call runs on a process-wide worker pool and the session only
+keeps the job ID. Any rerun, tab switch or reconnect (the ID is mirrored into
+the query string) looks the job up again and reattaches to it.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Finished jobs are kept this long so a reconnecting browser can still pick
+# up the result.
+JOB_RETENTION_SECONDS = 3600
+
+# Runs are dropped from the run registry once they have been idle (not
+# running and not looked up) this long.
+RUN_RETENTION_SECONDS = JOB_RETENTION_SECONDS
+
+
+class Job:
+    def __init__(self, kind, params, progress=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.progress = progress
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.released = False
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def release(self, keep=()):
+        """Hand the result to the caller, leaving only its ``keep`` keys on the job.
+
+        For sessions that move a large result under their own memory budget,
+        so the job does not hold it for ``JOB_RETENTION_SECONDS`` as well.
+        Only the first caller gets the result; later callers get None and
+        find the kept keys in ``result``.
+        """
+        with self._lock:
+            if self.released:
+                return None
+            result = self.result
+            self.result = {k: result.get(k) for k in keep} if isinstance(result, dict) else None
+            self.progress = None
+            self.released = True
+            return result
+
+    @property
+    def elapsed(self):
+        start = self.started_at or self.submitted_at
+        return (self.finished_at or time.time()) - start
+
+
+class JobManager:
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vys-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, progress=None, gate=None, requeue=(), **params):
+        """Run ``fn(**params)`` in the background and return the job ID.
+
+        A ``progress`` object, if given, is passed to ``fn`` and kept on the
+        job so the UI can render partial results while it runs. A ``gate``,
+        if given, is called with ``**params`` on its own thread and the job
+        only takes a worker once it returns; use it for waits that can take
+        minutes, such as API quota. If the gate raises, the job fails. If
+        ``fn`` raises one of the ``requeue`` exception types, the job frees
+        its worker and goes back through the gate.
+        """
+        job = Job(kind, params, progress)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        if gate is None:
+            self._executor.submit(self._run, job, fn, params)
+        else:
+            self._start_gate(job, gate, fn, params, requeue)
+        return job.id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _start_gate(self, job, gate, fn, params, requeue):
+        threading.Thread(target=self._gated, args=(job, gate, fn, params, requeue), daemon=True,
+                         name="vys-job-gate").start()
+
+    def _gated(self, job, gate, fn, params, requeue):
+        try:
+            gate(**params)
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+            job.finished_at = time.time()
+            job._done.set()
+            return
+        self._executor.submit(self._run, job, fn, params, gate, requeue)
+
+    def _run(self, job, fn, params, gate=None, requeue=()):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            if job.progress is not None:
+                job.result = fn(progress=job.progress, **params)
+            else:
+                job.result = fn(**params)
+            job.status = DONE
+        except requeue:
+            job.status = PENDING
+            self._start_gate(job, gate, fn, params, requeue)
+            return
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        job.finished_at = time.time()
+        job._done.set()
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+class RunRegistry:
+    """Process-wide lookup for multi-request runs (bulk audits, citation sweeps).
+
+    A run only needs an ``id``, ``created_at`` and a ``running`` property.
+    Runs expire by age rather than count, so other sessions starting runs
+    never push out one that is still being looked at.
+    """
+
+    def __init__(self, retention=RUN_RETENTION_SECONDS):
+        self.retention = retention
+        self._runs = {}
+        self._seen = {}  # run ID -> last time it was running or looked up
+        self._lock = threading.Lock()
+
+    def add(self, run):
+        with self._lock:
+            self._prune()
+            self._runs[run.id] = run
+            self._seen[run.id] = time.time()
+        return run.id
+
+    def get(self, run_id):
+        with self._lock:
+            self._prune()
+            run = self._runs.get(run_id)
+            if run is not None:
+                self._seen[run_id] = time.time()
+            return run
+
+    def _prune(self):
+        now = time.time()
+        for run_id, run in list(self._runs.items()):
+            if run.running:
+                self._seen[run_id] = now
+            elif now - self._seen[run_id] > self.retention:
+                del self._runs[run_id], self._seen[run_id]
+
+
+@st.cache_resource
+def get_run_registry():
+    return RunRegistry()
+
+
+@st.cache_resource
+def get_job_manager():
+    return JobManager(max_workers=int(os.getenv("JOB_WORKERS", "4")))
+
+
+@st.cache_resource
+def get_prefetch_manager():
+    """Separate small pool for page prefetches, so they never queue behind audits."""
+    return JobManager(max_workers=int(os.getenv("PREFETCH_WORKERS", "2")))
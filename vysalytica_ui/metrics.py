@@ -0,0 +1,177 @@
+"""In-process metrics for API calls, the response cache and script reruns.
+
+Every request made by ``ApiClient`` is recorded per route (latency histogram,
+bytes in/out, retries, errors) and appended to a bounded event log carrying
+the ``X-Request-ID`` sent upstream, so a slow call seen here can be matched
+against the ``vysalytica-api`` logs. Calls coalesced into an identical
+in-flight request are counted per route. Exposed as Prometheus text and JSON
+lines.
+"""
+import json
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float("inf"))
+MAX_EVENTS = 2000
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q):
+        """Upper bucket bound containing the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return self.buckets[-1]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+
+
+class Metrics:
+    def __init__(self, max_events=MAX_EVENTS):
+        self.routes = {}
+        self.reruns = {}  # page -> Histogram
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def _route(self, route):
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        return stats
+
+    def record_request(self, route, method, status, seconds, bytes_out=0, bytes_in=0,
+                       retries=0, error=None, request_id=None):
+        with self._lock:
+            stats = self._route(route)
+            stats.requests += 1
+            stats.retries += retries
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.latency.observe(seconds)
+            if error or status is None or status >= 400:
+                stats.errors += 1
+            self.events.append({
+                "ts": round(time.time(), 3), "type": "request", "route": route, "method": method,
+                "status": status, "seconds": round(seconds, 4), "bytes_in": bytes_in,
+                "bytes_out": bytes_out, "retries": retries, "error": error, "request_id": request_id,
+            })
+
+    def record_bytes_in(self, route, bytes_in):
+        """Body bytes of a streamed response, known only once it has been read."""
+        with self._lock:
+            self._route(route).bytes_in += bytes_in
+
+    def record_cache(self, route, hit):
+        with self._lock:
+            stats = self._route(route)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_coalesced(self, route):
+        """A call that joined an identical in-flight request instead of sending its own."""
+        with self._lock:
+            self._route(route).coalesced += 1
+
+    def record_rerun(self, page, seconds):
+        with self._lock:
+            self.reruns.setdefault(page, Histogram()).observe(seconds)
+            self.events.append({"ts": round(time.time(), 3), "type": "rerun", "page": page,
+                                "seconds": round(seconds, 4)})
+
+    def summary(self):
+        """One row per route for the diagnostics table."""
+        with self._lock:
+            rows = []
+            for route, s in sorted(self.routes.items()):
+                lookups = s.cache_hits + s.cache_misses
+                rows.append({
+                    "route": route,
+                    "requests": s.requests,
+                    "error_rate": round(s.errors / s.requests, 3) if s.requests else 0.0,
+                    "retries": s.retries,
+                    "avg_s": round(s.latency.sum / s.latency.count, 3) if s.latency.count else 0.0,
+                    "p50_s": s.latency.quantile(0.5),
+                    "p95_s": s.latency.quantile(0.95),
+                    "bytes_in": s.bytes_in,
+                    "bytes_out": s.bytes_out,
+                    "cache_hit_ratio": round(s.cache_hits / lookups, 3) if lookups else None,
+                    "coalesced": s.coalesced,
+                })
+            return rows
+
+    def rerun_summary(self):
+        with self._lock:
+            return [{"page": page, "reruns": h.count, "avg_s": round(h.sum / h.count, 3),
+                     "p50_s": h.quantile(0.5), "p95_s": h.quantile(0.95)}
+                    for page, h in sorted(self.reruns.items())]
+
+    def to_jsonl(self):
+        with self._lock:
+            return "".join(json.dumps(event) + "\n" for event in self.events)
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            def histogram(name, label, key, h):
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else bound
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{key}"}} {h.sum:.6f}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {h.count}')
+
+            lines.append("# TYPE vys_api_request_seconds histogram")
+            for route, s in sorted(self.routes.items()):
+                histogram("vys_api_request_seconds", "route", route, s.latency)
+            for name, attr in (("requests", "requests"), ("errors", "errors"), ("retries", "retries"),
+                               ("bytes_received", "bytes_in"), ("bytes_sent", "bytes_out"),
+                               ("cache_hits", "cache_hits"), ("cache_misses", "cache_misses"),
+                               ("coalesced", "coalesced")):
+                lines.append(f"# TYPE vys_api_{name}_total counter")
+                for route, s in sorted(self.routes.items()):
+                    lines.append(f'vys_api_{name}_total{{route="{route}"}} {getattr(s, attr)}')
+            lines.append("# TYPE vys_rerun_seconds histogram")
+            for page, h in sorted(self.reruns.items()):
+                histogram("vys_rerun_seconds", "page", page, h)
+        return "\n".join(lines) + "\n"
+
+
+@st.cache_resource
+def get_metrics():
+    return Metrics()
@@ -0,0 +1,47 @@
+"""Offset pagination with a per-session page cache.
+
+Pages already fetched stay in the pager (which lives in session state), and
+the page after the one being viewed is fetched in the background so that
+"Next" is usually instant. Used for audit history and stored answer graphs.
+"""
+
+# Longest a page view waits for its prefetch before fetching the page itself
+PREFETCH_WAIT = 5
+
+
+class OffsetPager:
+    def __init__(self, fetch, jobs, page_size=50):
+        """``fetch(limit=..., offset=...)`` returns one page as a list."""
+        self.fetch = fetch
+        self.jobs = jobs
+        self.page_size = page_size
+        self.pages = {}
+        self._prefetching = {}  # page number -> job ID
+
+    def _fetch(self, page):
+        return self.fetch(limit=self.page_size, offset=(page - 1) * self.page_size)
+
+    def get_page(self, page):
+        if page not in self.pages:
+            job = self.jobs.get(self._prefetching.pop(page, ""))
+            # A prefetch still queued for a worker is slower than fetching inline
+            if job is not None and job.started_at and job.wait(PREFETCH_WAIT) and job.error is None:
+                self.pages[page] = job.result
+            else:
+                self.pages[page] = self._fetch(page)
+        if self.has_next(page):
+            self.prefetch(page + 1)
+        return self.pages[page]
+
+    def has_next(self, page):
+        # A short page means the server ran out of rows
+        return len(self.pages.get(page, [])) == self.page_size
+
+    def prefetch(self, page):
+        if page in self.pages or page in self._prefetching:
+            return
+        self._prefetching[page] = self.jobs.submit("page_prefetch", self._fetch, page=page)
+
+    def loaded(self):
+        """Every row fetched so far, in page order."""
+        return [row for page in sorted(self.pages) for row in self.pages[page]]
@@ -0,0 +1,68 @@
+"""JSON decoding and payload trimming for large API responses.
+
+``loads``/``dumps`` use orjson when it is installed (optional dependency) and
+the stdlib ``json`` module otherwise. ``trim`` reduces decoded payloads to the
+fields the views actually render, so cached and session-held results don't
+carry raw crawl data the UI never shows.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+FINDING_FIELDS = ("id", "rule_id", "title", "category", "status", "why", "fix", "fix_snippet", "evidence", "url")
+AUDIT_FIELDS = ("audit_id", "id", "url", "domain", "plan", "packs", "page_count", "scores", "overall_score",
+                "created_at", "findings")
+HISTORY_FIELDS = ("id", "domain", "url", "overall_score", "page_count", "created_at", "packs")
+
+
+def loads(data):
+    """Decode JSON from ``bytes`` or ``str``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Encode ``obj`` as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _pick(d, fields):
+    return {k: d[k] for k in fields if k in d}
+
+
+def trim_finding(finding):
+    return _pick(finding, FINDING_FIELDS) if isinstance(finding, dict) else finding
+
+
+def trim_audit(audit):
+    if not isinstance(audit, dict):
+        return audit
+    trimmed = _pick(audit, AUDIT_FIELDS)
+    if isinstance(trimmed.get("findings"), list):
+        trimmed["findings"] = [trim_finding(f) for f in trimmed["findings"]]
+    return trimmed
+
+
+def trim_history(rows):
+    if not isinstance(rows, list):
+        return rows
+    return [_pick(row, HISTORY_FIELDS) if isinstance(row, dict) else row for row in rows]
+
+
+# Route template -> trimmer. Routes not listed are returned as decoded.
+ROUTE_TRIMMERS = {
+    "/api/audit": trim_audit,
+    "/api/audit/{id}": trim_audit,
+    "/api/audit/history": trim_history,
+}
+
+
+def trim(route, data):
+    trimmer = ROUTE_TRIMMERS.get(route)
+    return trimmer(data) if trimmer is not None else data
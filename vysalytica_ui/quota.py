@@ -0,0 +1,239 @@
+"""Client-side scheduling of quota-limited API calls.
+
+Every API key has a ``quota_per_hour``. Instead of sending requests past it
+and showing the resulting 429s, each key gets a token bucket (capacity and
+hourly refill equal to the quota) and calls wait in a per-key queue until a
+token is free. Interactive calls are ordered ahead of bulk work, and a
+``Ticket`` exposes queue position and estimated start time to the UI.
+Keys without a known quota are not limited; a 429 pauses the key until its
+``Retry-After`` and puts the call back in the queue.
+"""
+import bisect
+import itertools
+import threading
+import time
+
+INTERACTIVE = 0
+BULK = 1
+
+HOUR = 3600.0
+
+
+class QueueCancelled(Exception):
+    """The ticket was cancelled while waiting for quota."""
+
+
+class QuotaRequeued(Exception):
+    """A gated call was rejected with a 429 and has to wait for quota again."""
+
+    def __init__(self, ticket):
+        super().__init__("Rejected with 429 - waiting for API quota again")
+        self.ticket = ticket
+
+
+class TokenBucket:
+    def __init__(self, quota_per_hour):
+        self.capacity = float(quota_per_hour)
+        self.rate = self.capacity / HOUR  # tokens per second
+        self.tokens = self.capacity
+        self.updated = time.time()
+        self.paused_until = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        self.refill(now)
+        if now >= self.paused_until and self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until(self, needed, now):
+        """Seconds until ``needed`` tokens are available."""
+        self.refill(now)
+        missing = max(0.0, needed - self.tokens)
+        return max(self.paused_until - now, missing / self.rate if self.rate else float("inf"))
+
+
+class Ticket:
+    """One call's place in a key's queue; created by the caller to watch it wait."""
+
+    def __init__(self):
+        self.api_key = None
+        self.priority = None
+        self.seq = None
+        self.queued_at = None
+        self.granted_at = None
+        self.cancelled = False
+        self.refunded = False
+        self.gated = False  # waits for quota in a job gate (see ApiClient.reserve_quota)
+
+    @property
+    def waiting(self):
+        return self.queued_at is not None and self.granted_at is None and not self.cancelled
+
+    def requeue(self):
+        """Let a granted ticket wait again, after its call was rejected with a 429."""
+        self.queued_at = self.granted_at = None
+        self.refunded = False
+
+
+class QuotaScheduler:
+    def __init__(self, default_quota=None, poll=5.0):
+        self.default_quota = default_quota
+        self.poll = poll
+        self._quotas = {}  # api key (or visible suffix of a masked key) -> quota_per_hour
+        self._looked_up = set()  # keys already searched for in the key list
+        self._buckets = {}
+        self._queues = {}  # api key -> sorted [(priority, seq, ticket)]
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def set_quota(self, api_key, quota_per_hour):
+        with self._cond:
+            self._quotas[api_key] = quota_per_hour
+            bucket = self._buckets.pop(api_key, None)
+            if bucket is not None and quota_per_hour:
+                # Keep tokens already spent this hour
+                self._bucket(api_key).tokens = min(bucket.tokens, float(quota_per_hour))
+            self._cond.notify_all()
+
+    def register_keys(self, keys):
+        """Learn quotas from ``/api/keys/list`` rows, which show masked keys (``vys_****1a2b``)."""
+        for row in keys or []:
+            key, quota = row.get("key") or "", row.get("quota_per_hour")
+            if quota and "*" in key:
+                self.set_quota("*" + key.rsplit("*", 1)[1], quota)
+            elif quota and key:
+                self.set_quota(key, quota)
+
+    def knows(self, api_key):
+        """True once ``api_key``'s quota was learned, or looked up without success.
+
+        ``default_quota`` does not count, so it only applies to keys the key
+        list could not resolve.
+        """
+        with self._cond:
+            return api_key in self._looked_up or self._learned_quota(api_key) is not None
+
+    def looked_up(self, api_key):
+        """Record that the key list was consulted for ``api_key`` (found or not)."""
+        with self._cond:
+            self._looked_up.add(api_key)
+
+    def _learned_quota(self, api_key):
+        quota = self._quotas.get(api_key)
+        if quota is None:
+            quota = next((q for k, q in self._quotas.items() if k.startswith("*") and api_key.endswith(k[1:])), None)
+        return quota
+
+    def _quota_for(self, api_key):
+        quota = self._learned_quota(api_key)
+        return quota if quota is not None else self.default_quota
+
+    def _bucket(self, api_key):
+        bucket = self._buckets.get(api_key)
+        if bucket is None:
+            quota = self._quota_for(api_key)
+            if not quota:
+                return None
+            bucket = self._buckets[api_key] = TokenBucket(quota)
+        return bucket
+
+    def acquire(self, api_key, priority=INTERACTIVE, ticket=None):
+        """Block until ``api_key`` may send one more quota-limited call."""
+        ticket = ticket if ticket is not None else Ticket()
+        with self._cond:
+            bucket = self._bucket(api_key) if api_key else None
+            if bucket is None:
+                ticket.granted_at = time.time()
+                return ticket
+            if ticket.priority is not None:
+                priority = min(priority, ticket.priority)  # promoted before it was queued
+            ticket.api_key, ticket.priority, ticket.seq = api_key, priority, next(self._seq)
+            ticket.queued_at = time.time()
+            queue = self._queues.setdefault(api_key, [])
+            bisect.insort(queue, (priority, ticket.seq, ticket))
+            try:
+                while True:
+                    if ticket.cancelled:
+                        raise QueueCancelled("Cancelled while waiting for API quota")
+                    bucket = self._bucket(api_key)
+                    now = time.time()
+                    if queue[0][2] is ticket and (bucket is None or bucket.take(now)):
+                        ticket.granted_at = now
+                        return ticket
+                    wait = bucket.seconds_until(1, now) if bucket is not None else 0.0
+                    self._cond.wait(min(max(wait, 0.05), self.poll))
+            finally:
+                queue[:] = [e for e in queue if e[2] is not ticket]
+                self._cond.notify_all()
+
+    def promote(self, ticket, priority):
+        """Raise a ticket to ``priority`` if that is more urgent, e.g. when an
+        interactive call joins a bulk one that is still waiting."""
+        with self._cond:
+            if ticket.granted_at is not None or ticket.cancelled:
+                return
+            if ticket.priority is not None and ticket.priority <= priority:
+                return
+            ticket.priority = priority
+            queue = self._queues.get(ticket.api_key)
+            if ticket.waiting and queue is not None:
+                queue[:] = [e for e in queue if e[2] is not ticket]
+                bisect.insort(queue, (priority, ticket.seq, ticket))
+                self._cond.notify_all()
+
+    def refund(self, ticket):
+        """Give back the token of a granted ticket whose call was never sent."""
+        with self._cond:
+            bucket = self._buckets.get(ticket.api_key) if ticket.granted_at is not None else None
+            if bucket is None or ticket.refunded:
+                return
+            ticket.refunded = True
+            bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+            self._cond.notify_all()
+
+    def cancel(self, ticket):
+        with self._cond:
+            ticket.cancelled = True
+            self._cond.notify_all()
+
+    def pause(self, api_key, seconds):
+        """Hold all calls for ``api_key`` for ``seconds`` (after a 429)."""
+        with self._cond:
+            bucket = self._bucket(api_key)
+            if bucket is None:
+                bucket = self._buckets[api_key] = TokenBucket(1e9)
+            bucket.paused_until = max(bucket.paused_until, time.time() + seconds)
+            bucket.tokens = min(bucket.tokens, 0.0)
+
+    def position(self, ticket):
+        """1-based place in the key's queue, or None once the ticket is no longer waiting."""
+        with self._cond:
+            queue = self._queues.get(ticket.api_key, [])
+            return next((i + 1 for i, (_, _, t) in enumerate(queue) if t is ticket), None)
+
+    def eta(self, ticket):
+        """Estimated start time (epoch seconds) of a waiting ticket."""
+        position = self.position(ticket)
+        if position is None:
+            return None
+        with self._cond:
+            bucket = self._buckets.get(ticket.api_key)
+            now = time.time()
+            return now + (bucket.seconds_until(position, now) if bucket is not None else 0.0)
+
+    def status(self):
+        """Per-key quota and queue depth for diagnostics (keys shown by suffix only)."""
+        with self._cond:
+            now = time.time()
+            rows = []
+            for api_key, bucket in self._buckets.items():
+                bucket.refill(now)
+                rows.append({"key": "…" + api_key[-4:], "quota_per_hour": round(bucket.capacity),
+                             "tokens": round(bucket.tokens, 1), "waiting": len(self._queues.get(api_key, [])),
+                             "paused_s": round(max(0.0, bucket.paused_until - now), 1)})
+            return rows
@@ -0,0 +1,261 @@
+"""Per-session memory budget for large results kept across reruns.
+
+Views keep findings indexes, answer graphs, playbooks, exports and diffs in a
+``SessionMemory`` instead of bare ``st.session_state``. Each session has a
+budget; when it is exceeded the least-recently-viewed entries are spilled to a
+per-session temp directory and reloaded when viewed again; a reloaded value
+stays in memory, so reruns reuse one object. Payloads at or above the spill
+threshold (DOCX exports, very large audits) are written to disk as soon as
+they are kept, so dropping them from memory later costs nothing, and large
+exports are only read back when downloaded. When Streamlit drops an expired
+session its ``SessionMemory`` is garbage collected and the spill directory is
+deleted with it.
+"""
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+MB = 1024 * 1024
+SESSION_MEMORY_KEY = "_session_memory"
+SPILL_ROOT = os.path.join(tempfile.gettempdir(), "vysalytica-spill")
+ORPHAN_MAX_AGE = 24 * 3600
+
+
+def estimate_size(obj, _seen=None):
+    """Approximate deep size in bytes of plain containers, DataFrames and simple objects."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray)):
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not callable(obj):
+        size += estimate_size(vars(obj), seen)
+    return size
+
+
+class Entry:
+    def __init__(self, value, size):
+        self.value = value
+        self.size = size
+        self.loaded = True  # value is held in memory
+        self.path = None  # set once written to disk
+        self.raw = isinstance(value, bytes)  # written as raw bytes rather than pickled
+        self.viewed_at = time.time()
+
+    @property
+    def where(self):
+        if self.path is None:
+            return "memory"
+        return "memory+disk" if self.loaded else "disk"
+
+
+class SessionMemory:
+    def __init__(self, budget=128 * MB, spill_threshold=16 * MB, disk_budget=512 * MB, spill_root=SPILL_ROOT):
+        self.id = uuid.uuid4().hex[:12]
+        self.budget = budget
+        self.spill_threshold = spill_threshold
+        self.disk_budget = disk_budget
+        self.spill_root = spill_root
+        self.dir = None  # created on first spill
+        self.evictions = 0
+        self.created_at = time.time()
+        self._entries = OrderedDict()  # name -> Entry, least recently viewed first
+        self._lock = threading.RLock()
+        self._finalizer = None
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._entries
+
+    def put(self, name, value, size=None):
+        """Keep ``value`` under ``name``; ``size`` defaults to ``estimate_size(value)``."""
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            self._discard(name)
+            entry = self._entries[name] = Entry(value, size)
+            if size >= self.spill_threshold and self._write(entry) and entry.raw:
+                # Large exports are only read back when downloaded
+                entry.value, entry.loaded = None, False
+            self._enforce(keep=name)
+
+    def get(self, name, default=None):
+        """The value for ``name`` (reloaded from disk if spilled), marking it recently viewed."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return default
+            entry.viewed_at = time.time()
+            self._entries.move_to_end(name)
+            if entry.loaded:
+                return entry.value
+            value = self._load(entry)
+            if value is None:
+                self._discard(name)
+                return default
+            if entry.size <= self.budget and not (entry.raw and entry.size >= self.spill_threshold):
+                # Keep it loaded (the file stays, so evicting it again is free)
+                # so that reruns reuse one object instead of unpickling each time
+                entry.value, entry.loaded = value, True
+                self._enforce(keep=name)
+            return value
+
+    def pop(self, name):
+        with self._lock:
+            self._discard(name)
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._entries):
+                self._discard(name)
+
+    def usage(self):
+        with self._lock:
+            in_memory = sum(e.size for e in self._entries.values() if e.loaded)
+            on_disk = sum(e.size for e in self._entries.values() if not e.loaded)
+            return {"session": self.id, "entries": len(self._entries), "memory_bytes": in_memory,
+                    "spilled_bytes": on_disk, "budget_bytes": self.budget, "evictions": self.evictions}
+
+    def entries(self):
+        with self._lock:
+            return [{"name": name, "size_bytes": e.size, "where": e.where,
+                     "viewed_s_ago": round(time.time() - e.viewed_at)} for name, e in reversed(self._entries.items())]
+
+    # ------------------------------------------------------------------
+    def _discard(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._unlink(entry)
+
+    @staticmethod
+    def _unlink(entry):
+        if entry.path is not None:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+            entry.path = None
+
+    def _write(self, entry):
+        """Write ``entry`` to disk; returns False if its value can't be pickled."""
+        if self.dir is None:
+            os.makedirs(self.spill_root, exist_ok=True)
+            self.dir = tempfile.mkdtemp(prefix=f"{self.id}-", dir=self.spill_root)
+            # Deletes the directory when the session's state is garbage collected (or at exit)
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self.dir, True)
+        path = os.path.join(self.dir, uuid.uuid4().hex)
+        try:
+            with open(path, "wb") as f:
+                if entry.raw:
+                    f.write(entry.value)
+                else:
+                    pickle.dump(entry.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, OSError):
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        entry.path = path
+        return True
+
+    @staticmethod
+    def _load(entry):
+        try:
+            with open(entry.path, "rb") as f:
+                return f.read() if entry.raw else pickle.load(f)
+        except OSError:
+            return None
+
+    def _enforce(self, keep=None):
+        in_memory = sum(e.size for e in self._entries.values() if e.loaded)
+        for name, entry in list(self._entries.items()):
+            if in_memory <= self.budget:
+                break
+            if name == keep or not entry.loaded:
+                continue
+            in_memory -= entry.size
+            self.evictions += 1
+            if entry.path is None and not self._write(entry):
+                self._discard(name)
+            else:
+                entry.value, entry.loaded = None, False
+        on_disk = sum(e.size for e in self._entries.values() if e.path is not None)
+        for name, entry in list(self._entries.items()):
+            if on_disk <= self.disk_budget:
+                break
+            if name == keep or entry.path is None:
+                continue
+            on_disk -= entry.size
+            if entry.loaded:
+                self._unlink(entry)  # still held in memory; only the disk copy goes
+            else:
+                self._discard(name)
+
+
+class MemoryRegistry:
+    """Live ``SessionMemory`` objects in this process, for reporting."""
+
+    def __init__(self):
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+        remove_orphans(SPILL_ROOT)
+
+    def add(self, memory):
+        with self._lock:
+            self._sessions.add(memory)
+
+    def usage(self):
+        with self._lock:
+            sessions = list(self._sessions)
+        return sorted((m.usage() for m in sessions), key=lambda u: -u["memory_bytes"])
+
+
+def remove_orphans(root, max_age=ORPHAN_MAX_AGE):
+    """Delete spill directories left behind by a process that did not exit cleanly."""
+    if not os.path.isdir(root):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+@st.cache_resource
+def get_memory_registry():
+    return MemoryRegistry()
+
+
+def get_session_memory():
+    """This session's ``SessionMemory``, created on first use."""
+    memory = st.session_state.get(SESSION_MEMORY_KEY)
+    if memory is None:
+        memory = SessionMemory(
+            budget=int(float(os.getenv("SESSION_MEMORY_MB", "128")) * MB),
+            spill_threshold=int(float(os.getenv("SESSION_SPILL_MB", "16")) * MB),
+            disk_budget=int(float(os.getenv("SESSION_DISK_MB", "512")) * MB),
+        )
+        st.session_state[SESSION_MEMORY_KEY] = memory
+        get_memory_registry().add(memory)
+    return memory
@@ -0,0 +1,80 @@
+"""Process-wide single-flight coalescing of identical in-flight calls.
+
+The first caller for a key runs the call; callers arriving with the same key
+while it is in flight wait for it and receive the same result (or exception)
+instead of sending their own upstream request. Shared results must be treated
+as read-only, like cached responses.
+"""
+import hashlib
+import json
+import threading
+
+
+def key_hash(api_key):
+    """Short hash of an API key, or "" without one; never the key itself."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else ""
+
+
+def flight_key(path, payload, api_key=None):
+    """Key for a POST: path, canonical JSON body and a hash of the API key.
+
+    The key hash keeps callers with different keys (and plans/quotas) apart.
+    """
+    return f"{path}|{key_hash(api_key)}|{json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)}"
+
+
+class Call:
+    def __init__(self, context=None):
+        self.context = context  # leader-provided, e.g. its progress object
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, context=None, on_wait=None, on_join=None, poll=0.5):
+        """Run ``fn()`` once per in-flight ``key``; returns ``(value, shared)``.
+
+        Followers call ``on_join(leader_context)`` once when they join, then
+        ``on_wait(leader_context)`` every ``poll`` seconds while waiting and
+        once more when the call finishes.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Call(context)
+            else:
+                call.followers += 1
+
+        if not leader and on_join is not None:
+            on_join(call.context)
+        if leader:
+            try:
+                call.value = fn()
+                return call.value, False
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        while not call.done.wait(poll):
+            if on_wait is not None:
+                on_wait(call.context)
+        if on_wait is not None:
+            on_wait(call.context)
+        if call.error is not None:
+            raise call.error
+        return call.value, True
+
+    def in_flight(self):
+        with self._lock:
+            return {key: call.followers for key, call in self._calls.items()}
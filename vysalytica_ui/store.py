@@ -0,0 +1,127 @@
+"""Persistent local store of finished audit results (SQLite).
+
+Results are keyed by normalized URL, plan, sorted packs and a hash of the API
+key, so re-running the same audit with the same key within the freshness
+window is answered locally instead of paying for another crawl and quota hit.
+Keyed results are never returned to a caller with another key or no key. Results are also indexed by ``audit_id`` so
+the history tab can show previously seen audits without a network call.
+"""
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from .payloads import dumps, loads
+from .singleflight import key_hash
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "vysalytica-ui", "audits.sqlite3")
+DEFAULT_FRESHNESS = 15 * 60
+DEFAULT_MAX_ROWS = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    rowid INTEGER PRIMARY KEY,
+    audit_id INTEGER UNIQUE,
+    audit_key TEXT,
+    url TEXT,
+    stored_at REAL NOT NULL,
+    result BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audits_key ON audits (audit_key, stored_at);
+"""
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """Lowercase scheme and host, drop default ports, fragments and trailing slashes."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = "&".join(sorted(q for q in parts.query.split("&") if q))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def audit_key(url, plan, packs, api_key=None):
+    return "|".join((normalize_url(url), plan or "", ",".join(sorted(packs or [])), key_hash(api_key)))
+
+
+class AuditStore:
+    def __init__(self, path=DEFAULT_PATH, freshness=DEFAULT_FRESHNESS, max_rows=DEFAULT_MAX_ROWS):
+        self.path = path
+        self.freshness = freshness
+        self.max_rows = max_rows
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load(row):
+        result = loads(row[0])
+        result["stored_at"] = row[1]
+        return result
+
+    def lookup(self, url, plan, packs, api_key=None, freshness=None):
+        """Newest stored result for this audit and key if younger than ``freshness`` seconds."""
+        freshness = self.freshness if freshness is None else freshness
+        if freshness <= 0:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, stored_at FROM audits WHERE audit_key = ? AND stored_at >= ?"
+                " ORDER BY stored_at DESC LIMIT 1",
+                (audit_key(url, plan, packs, api_key), time.time() - freshness),
+            ).fetchone()
+        return self._load(row) if row else None
+
+    def get(self, audit_id):
+        """Stored result for ``audit_id`` regardless of age (finished audits don't change)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, stored_at FROM audits WHERE audit_id = ?", (int(audit_id),)
+            ).fetchone()
+        return self._load(row) if row else None
+
+    def known_ids(self, audit_ids):
+        ids = [int(i) for i in audit_ids if i is not None]
+        if not ids:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT audit_id FROM audits WHERE audit_id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def save(self, result, url=None, plan=None, packs=None, api_key=None):
+        """Store ``result``; ``url``/``plan``/``packs``/``api_key`` make it reusable by ``lookup``."""
+        result = {k: v for k, v in result.items() if k != "stored_at"}
+        audit_id = result.get("audit_id") or result.get("id")
+        key = audit_key(url, plan, packs, api_key) if url else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO audits (audit_id, audit_key, url, stored_at, result) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (audit_id) DO UPDATE SET"
+                " audit_key = COALESCE(excluded.audit_key, audit_key), url = COALESCE(excluded.url, url),"
+                " stored_at = excluded.stored_at, result = excluded.result",
+                (audit_id, key, url, time.time(), dumps(result)),
+            )
+            self._conn.execute(
+                "DELETE FROM audits WHERE rowid NOT IN (SELECT rowid FROM audits ORDER BY stored_at DESC LIMIT ?)",
+                (self.max_rows,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM audits")
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(result)), 0) FROM audits").fetchone()
+        return {"audits": count, "bytes": size, "path": self.path}
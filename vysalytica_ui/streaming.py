@@ -0,0 +1,139 @@
+"""Incremental audit results from an NDJSON or Server-Sent Events response.
+
+The audit endpoint is asked for ``application/x-ndjson`` / ``text/event-stream``.
+Each event is one JSON object with an ``event`` field (for SSE the ``event:``
+line is used instead)::
+
+    {"event": "progress", "pages_scanned": 12, "score": 71}
+    {"event": "finding", "finding": {...}}
+    {"event": "findings", "findings": [{...}, ...]}
+    {"event": "done", "data": {"audit_id": 42, "scores": {...}, "page_count": 40}}
+    {"event": "error", "error": "crawl blocked by robots.txt"}
+
+Events are parsed line by line as they arrive and applied to an
+``AuditStream``, so findings are only ever held once, in ``findings``.
+"""
+import threading
+import time
+
+from .payloads import loads, trim_audit, trim_finding
+
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+STREAM_ACCEPT = f"{NDJSON}, {SSE};q=0.9, application/json;q=0.5"
+
+
+class StreamError(Exception):
+    """An ``error`` event sent by the server mid-stream."""
+
+
+def _lines(resp, read):
+    for line in resp.iter_lines():
+        if read is not None:
+            read["bytes"] += len(line) + 1
+        yield line
+
+
+def iter_events(resp, read=None):
+    """Yield ``(event, payload)`` tuples from a streaming response.
+
+    Chunked responses have no Content-Length, so body bytes consumed are added
+    to ``read["bytes"]`` when a ``read`` dict is given.
+    """
+    content_type = resp.headers.get("Content-Type", "")
+    if SSE in content_type:
+        event, data = None, []
+        for raw in _lines(resp, read):
+            line = raw.decode("utf-8")
+            if not line:
+                if data:
+                    payload = loads("\n".join(data))
+                    yield event or payload.get("event", "message"), payload
+                event, data = None, []
+            elif line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                data.append(line[5:].strip())
+        if data:
+            payload = loads("\n".join(data))
+            yield event or payload.get("event", "message"), payload
+    else:
+        for line in _lines(resp, read):
+            if line:
+                payload = loads(line)
+                yield payload.get("event", "message"), payload
+
+
+class AuditStream:
+    """Progress of one streaming audit, readable from the UI while it runs."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.first_finding_at = None
+        self.pages_scanned = 0
+        self.score = None
+        self.findings = []
+        self.summary = {}
+        self.done = False
+        self._lock = threading.Lock()
+
+    def apply(self, event, payload):
+        with self._lock:
+            if event == "progress":
+                self.pages_scanned = payload.get("pages_scanned", self.pages_scanned)
+                self.score = payload.get("score", self.score)
+            elif event in ("finding", "findings"):
+                batch = payload.get("findings") or [payload.get("finding")]
+                if self.first_finding_at is None:
+                    self.first_finding_at = time.time()
+                self.findings.extend(trim_finding(f) for f in batch if f)
+            elif event == "done":
+                self.summary = trim_audit(payload.get("data") or {})
+                # Servers may repeat the findings in the final event; keep the
+                # streamed list so they are not held twice.
+                trailing = self.summary.pop("findings", None)
+                if trailing and not self.findings:
+                    self.findings = trailing
+                self.done = True
+            elif event == "error":
+                raise StreamError(payload.get("error") or "Audit failed")
+
+    def mirror(self, other):
+        """Show ``other``'s progress here (a coalesced audit run by another session)."""
+        if other is None or other is self:
+            return
+        with other._lock:
+            state = (other.pages_scanned, other.score, other.findings, other.first_finding_at)
+        with self._lock:
+            self.pages_scanned, self.score, self.findings, first_finding_at = state
+            if first_finding_at is not None and self.first_finding_at is None:
+                self.first_finding_at = max(first_finding_at, self.started_at)
+
+    def load_result(self, result):
+        """Fill the stream from a plain (non-streaming) JSON result."""
+        with self._lock:
+            self.findings = result.get("findings", [])
+            self.summary = {k: v for k, v in result.items() if k != "findings"}
+            self.pages_scanned = result.get("page_count", 0)
+            self.score = result.get("scores", {}).get("overall")
+            if self.findings:
+                self.first_finding_at = time.time()
+            self.done = True
+
+    def snapshot(self, last=100):
+        """Counters plus the most recent ``last`` findings, for partial rendering."""
+        with self._lock:
+            return {
+                "pages_scanned": self.pages_scanned,
+                "score": self.score,
+                "finding_count": len(self.findings),
+                "recent": self.findings[-last:],
+                "time_to_first_finding": (self.first_finding_at - self.started_at) if self.first_finding_at else None,
+            }
+
+    def result(self):
+        result = dict(self.summary, findings=self.findings)
+        result.setdefault("page_count", self.pages_scanned)
+        if self.score is not None:
+            result.setdefault("scores", {"overall": self.score})
+        return result
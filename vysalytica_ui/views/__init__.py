@@ -0,0 +1 @@
+"""Feature pages, imported lazily by ``streamlit_app.py`` on first visit."""
@@ -0,0 +1,112 @@
+"""Answer graph builder and stored graph viewer."""
+from functools import partial
+
+import streamlit as st
+
+from vysalytica_ui.answer_graph import INTENT, CompactGraph, graph_key
+from vysalytica_ui.api_client import get_client
+from vysalytica_ui.jobs import get_prefetch_manager
+from vysalytica_ui.paging import OffsetPager
+from vysalytica_ui.session_memory import get_session_memory
+from vysalytica_ui.views.common import coming_soon, end_coming_soon
+
+client = get_client()
+prefetch = get_prefetch_manager()
+
+BUILT_GRAPH_KEY = "answer_graph_built"
+GRAPH_PAGER_KEY = "answer_graph_pager"
+GRAPH_PAGE_SIZE = 5
+
+
+@st.cache_resource(max_entries=64)
+def compact_graph(key, _payload):
+    # Keyed by graph ID / content hash; the payload itself is never hashed
+    return CompactGraph.from_payload(_payload)
+
+
+@st.fragment
+def render_graph(key, payload, prefix):
+    # ``prefix`` names the call site, since the same graph can be shown twice
+    graph = compact_graph(key, payload)
+    counts = graph.counts()
+    st.caption(" · ".join(f"{n} {kind}(s)" for kind, n in counts.items()))
+    if len(graph) > 1:
+        st.graphviz_chart(graph.to_dot())
+    
+    intents = graph.nodes_of(INTENT)
+    if intents:
+        node = st.selectbox(
+            "Intent details",
+            [None] + intents,
+            format_func=lambda i: "Select an intent..." if i is None else graph.labels[i],
+            key=f"graph_node_{prefix}_{key}",
+        )
+        if node is not None:
+            st.json(graph.details[node], expanded=False)
+
+
+def render():
+    coming_soon("Answer Graph")
+    
+    st.header("Answer Graph Builder")
+    st.write("Map how AI assistants answer key intents for your domain")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Build Answer Graph")
+        with st.form("answer_graph_form"):
+            domain = st.text_input("Domain", placeholder="example.com")
+            intents_input = st.text_area("Intents (one per line)", placeholder="best project management\nproject management for teams")
+            ag_packs = st.multiselect("Packs", ["base", "ecomm", "docs"], default=["base"])
+            build_btn = st.form_submit_button("Build Graph")
+        
+        if build_btn:
+            if domain and intents_input:
+                intents = [i.strip() for i in intents_input.split("\n") if i.strip()]
+                with st.spinner("Building answer graph..."):
+                    try:
+                        result = client.build_answer_graph(domain, intents, ag_packs)
+                        result.setdefault("domain", domain)
+                        get_session_memory().put(BUILT_GRAPH_KEY, (graph_key(result), result))
+                        st.success("Answer graph built!")
+                    except Exception as e:
+                        st.error(f"Error: {e}")
+        
+        built = get_session_memory().get(BUILT_GRAPH_KEY)
+        if built is not None:
+            key, result = built
+            st.metric("Priority Score", result.get("priority_score", 0))
+            render_graph(key, result, "built")
+    
+    with col2:
+        st.subheader("View Answer Graphs")
+        view_domain = st.text_input("Domain (to view)", placeholder="example.com")
+        if st.button("Load Graphs"):
+            if view_domain:
+                fetch = partial(client.list_answer_graphs, view_domain)
+                st.session_state[GRAPH_PAGER_KEY] = OffsetPager(fetch, prefetch, page_size=GRAPH_PAGE_SIZE)
+        
+        pager = st.session_state.get(GRAPH_PAGER_KEY)
+        if pager is not None:
+            try:
+                if not pager.pages:
+                    pager.get_page(1)
+                last = max(pager.pages)
+                if pager.has_next(last) and st.button("Load more"):
+                    pager.get_page(last + 1)
+            except Exception as e:
+                st.error(f"Error: {e}")
+            
+            graphs = pager.loaded()
+            st.write(f"Loaded {len(graphs)} graph(s)")
+            if graphs:
+                choice = st.selectbox(
+                    "Graph",
+                    range(len(graphs)),
+                    format_func=lambda i: f"Graph {graphs[i].get('id')} - {graphs[i].get('created_at', '')}",
+                )
+                g = graphs[choice]
+                render_graph(graph_key(g), g, "listed")
+    
+    end_coming_soon()
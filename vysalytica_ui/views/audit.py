@@ -0,0 +1,241 @@
+"""Audit tool: single-URL audits as background jobs, and bulk audits."""
+import time
+
+import streamlit as st
+
+from vysalytica_ui.api_client import ApiError, get_client
+from vysalytica_ui.bulk import BulkAuditRun, parse_url_list
+from vysalytica_ui.findings import FindingsIndex
+from vysalytica_ui.jobs import get_job_manager, get_run_registry
+from vysalytica_ui.quota import QueueCancelled, QuotaRequeued, Ticket
+from vysalytica_ui.session_memory import get_session_memory
+from vysalytica_ui.streaming import AuditStream
+from vysalytica_ui.views.common import findings_viewer
+
+client = get_client()
+jobs = get_job_manager()
+runs = get_run_registry()
+
+AUDIT_JOB_KEY = "audit_job"
+AUDIT_RESULT_KEY = "audit_result"
+
+
+def take_audit_result(job):
+    """``(result, findings index)`` for a finished audit job, kept in session memory.
+
+    The result moves from the job into this session's memory budget and the
+    job keeps only the audit ID, so another session reattaching to the job
+    reloads the result from the audit store. The index is built once per job.
+    """
+    memory = get_session_memory()
+    cached = memory.get(AUDIT_RESULT_KEY)
+    if cached is not None and cached[0] == job.id:
+        return cached[1], cached[2]
+    result = job.release(keep=("audit_id",))
+    if result is None:
+        audit_id = (job.result or {}).get("audit_id")
+        if audit_id is None:
+            return None, None
+        # The job's own result, just run - not a stored one being reused
+        result = {k: v for k, v in client.get_audit(audit_id).items() if k != "stored_at"}
+    index = FindingsIndex(result.get("findings", []))
+    memory.put(AUDIT_RESULT_KEY, (job.id, result, index))
+    return result, index
+
+
+def render_audit_result(result, index):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Overall Score", f"{int(result.get('scores', {}).get('overall', 0))}/100")
+    col2.metric("Pages Scanned", result.get("page_count", 0))
+    col3.metric("Audit ID", result.get("audit_id", "N/A"))
+    if result.get("stored_at"):
+        minutes = int((time.time() - result["stored_at"]) // 60)
+        st.caption(f"Stored result from {minutes} min ago - tick \"Force refresh\" to re-run the crawl")
+    
+    st.subheader("Findings")
+    findings_viewer(index)
+
+
+@st.fragment(run_every=1)
+def poll_audit_job(job_id):
+    # Only this fragment reruns while the crawl is in progress; once the job
+    # finishes, a full rerun renders the result in the normal page flow.
+    job = jobs.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    ticket = job.params.get("ticket")
+    position = client.quota.position(ticket) if ticket is not None else None
+    if position is not None:
+        render_quota_wait(f"position {position} in the queue", client.quota.eta(ticket))
+        if st.button("Cancel queued audit"):
+            client.quota.cancel(ticket)
+            job.wait(2)
+            st.rerun()
+        return
+    st.info(f"Running {job.params['plan']} audit of {job.params['url']}... ({int(job.elapsed)}s)")
+    if job.progress is not None:
+        render_audit_progress(job.progress.snapshot())
+
+
+def render_quota_wait(place, eta):
+    when = time.strftime("%H:%M:%S", time.localtime(eta)) if eta else "soon"
+    st.info(f"Hourly quota for this API key is used up - {place}, estimated start at {when}")
+
+
+def render_audit_progress(snap):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pages Scanned", snap["pages_scanned"])
+    col2.metric("Running Score", "-" if snap["score"] is None else f"{int(snap['score'])}/100")
+    col3.metric("Findings So Far", snap["finding_count"])
+    if snap["time_to_first_finding"] is not None:
+        st.caption(f"First finding after {snap['time_to_first_finding']:.1f}s - showing the latest {len(snap['recent'])}")
+        st.dataframe(
+            [{col: f.get(col, "") for col in ("title", "category", "status")} for f in snap["recent"]],
+            hide_index=True,
+        )
+
+
+def render_single_audit():
+    with st.form("audit_form"):
+        url = st.text_input("Website URL", placeholder="https://example.com")
+        plan = st.selectbox("Plan", ["quickscan", "full", "agency"])
+        packs = st.multiselect("Rule Packs", ["base", "ecomm", "docs"], default=["base"])
+        api_key = st.text_input("API Key (required for Full/Agency)", type="password")
+        stream = st.checkbox("Stream findings while the crawl runs", value=True)
+        force_refresh = st.checkbox("Force refresh", help="Re-run the crawl even if this audit was stored recently")
+        submitted = st.form_submit_button("Run Audit")
+    
+    # Reattach to a running audit after a rerun or a browser reconnect
+    if AUDIT_JOB_KEY not in st.session_state and AUDIT_JOB_KEY in st.query_params:
+        st.session_state[AUDIT_JOB_KEY] = st.query_params[AUDIT_JOB_KEY]
+    
+    if submitted:
+        if not url or not url.startswith("http"):
+            st.error("Please enter a valid URL")
+        else:
+            running = jobs.get(st.session_state.get(AUDIT_JOB_KEY, ""))
+            if running is not None and not running.finished:
+                st.warning("An audit is already running - showing its progress below")
+            else:
+                params = {"url": url, "plan": plan, "packs": packs, "api_key": api_key or None,
+                          "force_refresh": force_refresh, "ticket": Ticket()}
+                # Over-quota audits wait in reserve_quota, outside the shared worker pool
+                if stream:
+                    job_id = jobs.submit("audit", client.stream_audit, progress=AuditStream(),
+                                         gate=client.reserve_quota, requeue=(QuotaRequeued,), **params)
+                else:
+                    job_id = jobs.submit("audit", client.run_audit, gate=client.reserve_quota,
+                                         requeue=(QuotaRequeued,), **params)
+                st.session_state[AUDIT_JOB_KEY] = job_id
+                st.query_params[AUDIT_JOB_KEY] = job_id
+    
+    job_id = st.session_state.get(AUDIT_JOB_KEY)
+    if job_id:
+        job = jobs.get(job_id)
+        if job is None:
+            st.warning("The previous audit job has expired - please run it again")
+            del st.session_state[AUDIT_JOB_KEY]
+            st.query_params.pop(AUDIT_JOB_KEY, None)
+        elif not job.finished:
+            poll_audit_job(job_id)
+        elif job.error is not None:
+            if isinstance(job.error, QueueCancelled):
+                st.info("Audit cancelled while waiting for API quota")
+            elif isinstance(job.error, ApiError):
+                st.error(str(job.error))
+            else:
+                st.error(f"Error: {job.error}")
+        else:
+            try:
+                result, index = take_audit_result(job)
+            except ApiError as e:
+                st.error(str(e))
+            else:
+                if result is None:
+                    st.warning("The previous audit result has expired - please run it again")
+                else:
+                    render_audit_result(result, index)
+
+
+BULK_RUN_KEY = "bulk_audit_run"
+
+
+@st.fragment(run_every=2)
+def poll_bulk_run(run_id):
+    run = runs.get(run_id)
+    counts = run.counts()
+    finished = counts.get("done", 0) + counts.get("error", 0)
+    st.progress(finished / len(run.urls), text=f"{finished}/{len(run.urls)} audited - "
+                + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    waiting, eta = run.quota_wait()
+    if waiting:
+        render_quota_wait(f"{waiting} audit(s) queued", eta)
+    st.dataframe(run.table(), hide_index=True)
+    if not run.running:
+        st.rerun()
+
+
+def render_bulk_audit():
+    with st.form("bulk_audit_form"):
+        upload = st.file_uploader("URL list (CSV with a 'url' column, or sitemap.xml)", type=["csv", "txt", "xml"])
+        plan = st.selectbox("Plan", ["quickscan", "full", "agency"], key="bulk_plan")
+        packs = st.multiselect("Rule Packs", ["base", "ecomm", "docs"], default=["base"], key="bulk_packs")
+        api_key = st.text_input("API Key (required for Full/Agency)", type="password", key="bulk_api_key")
+        concurrency = st.slider("Concurrent audits", 1, 16, 4)
+        submitted = st.form_submit_button("Run Bulk Audit")
+    
+    if submitted:
+        if upload is None:
+            st.error("Please upload a CSV or sitemap.xml")
+        else:
+            try:
+                urls = parse_url_list(upload.getvalue(), upload.name)
+            except Exception as e:
+                st.error(f"Could not read {upload.name}: {e}")
+            else:
+                if urls:
+                    run = BulkAuditRun(client, urls, plan, packs, api_key=api_key or None, concurrency=concurrency)
+                    st.session_state[BULK_RUN_KEY] = st.query_params[BULK_RUN_KEY] = runs.add(run)
+                    run.start()
+                else:
+                    st.error("No http(s) URLs found in the uploaded file")
+    
+    # Reattach to a bulk run after a reload, like single audits
+    if BULK_RUN_KEY not in st.session_state and BULK_RUN_KEY in st.query_params:
+        st.session_state[BULK_RUN_KEY] = st.query_params[BULK_RUN_KEY]
+    run_id = st.session_state.get(BULK_RUN_KEY)
+    if not run_id:
+        return
+    run = runs.get(run_id)
+    if run is None:
+        st.warning("The previous bulk audit has expired - please run it again")
+        del st.session_state[BULK_RUN_KEY]
+        st.query_params.pop(BULK_RUN_KEY, None)
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    if run.running:
+        if col1.button("Cancel"):
+            run.cancel()
+            st.rerun()
+    elif run.counts().get("done", 0) < len(run.urls):
+        if col1.button("Resume"):
+            run.start()
+            st.rerun()
+    
+    if run.running:
+        poll_bulk_run(run.id)
+    else:
+        st.dataframe(run.table(), hide_index=True)
+    col2.download_button("📥 Export CSV", run.to_csv(), f"bulk_audit_{run.id}.csv", "text/csv")
+    col3.download_button("📥 Export JSONL", run.to_jsonl(), f"bulk_audit_{run.id}.jsonl", "application/jsonl")
+
+
+def render():
+    st.header("AI Visibility Audit")
+    
+    mode = st.radio("Mode", ["Single URL", "Bulk"], horizontal=True, label_visibility="collapsed")
+    if mode == "Single URL":
+        render_single_audit()
+    else:
+        render_bulk_audit()
@@ -0,0 +1,93 @@
+"""Citation tracker: parallel citation sweeps and per-brand stats."""
+import streamlit as st
+
+from vysalytica_ui.api_client import get_client
+from vysalytica_ui.citations import CitationSweep
+from vysalytica_ui.jobs import get_run_registry
+from vysalytica_ui.views.common import coming_soon, end_coming_soon
+
+client = get_client()
+runs = get_run_registry()
+
+CITATION_SWEEP_KEY = "citation_sweep"
+
+
+def render_citation_sweep(sweep):
+    summary = sweep.summary()
+    done = summary["total"] + summary["errors"]
+    if done < summary["pairs"]:
+        st.progress(done / summary["pairs"], text=f"{done}/{summary['pairs']} queries answered")
+    st.success(f"Citation Rate: {summary['rate']}% ({summary['cited']}/{summary['total']})")
+    
+    for r in sweep.table():
+        if r["status"] == "pending":
+            continue
+        if r["error"]:
+            st.error(f"{r['intent']} · {r['assistant']}: {r['error']}")
+            continue
+        cited = "✅ Cited" if r["cited"] else "❌ Not Cited"
+        with st.expander(f"{r['intent']} · {r['assistant']} - {cited}"):
+            st.write(r["excerpt"])
+
+
+@st.fragment(run_every=1)
+def poll_citation_sweep(sweep_id):
+    sweep = runs.get(sweep_id)
+    render_citation_sweep(sweep)
+    if not sweep.running:
+        st.rerun()
+
+
+def render():
+    coming_soon("Citation Tracker")
+    
+    st.header("AI Citation Tracker")
+    st.write("Track how often your brand is cited by ChatGPT and Claude")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Track New Citations")
+        with st.form("citation_form"):
+            brand = st.text_input("Brand Name", placeholder="Asana")
+            intents_text = st.text_area("Search Intents (one per line)", placeholder="best project management tools\nproject management for startups")
+            assistants = st.multiselect("AI Assistants", ["chatgpt", "claude"], default=["chatgpt", "claude"])
+            concurrency = st.slider("Concurrent queries", 1, 16, 8)
+            track_btn = st.form_submit_button("Track Citations")
+        
+        if track_btn:
+            intents = list(dict.fromkeys(i.strip() for i in intents_text.split("\n") if i.strip()))
+            if brand and intents and assistants:
+                sweep = CitationSweep(client, brand, intents, assistants, concurrency=concurrency)
+                st.session_state[CITATION_SWEEP_KEY] = st.query_params[CITATION_SWEEP_KEY] = runs.add(sweep)
+                sweep.start()
+        
+        if CITATION_SWEEP_KEY not in st.session_state and CITATION_SWEEP_KEY in st.query_params:
+            st.session_state[CITATION_SWEEP_KEY] = st.query_params[CITATION_SWEEP_KEY]
+        sweep_id = st.session_state.get(CITATION_SWEEP_KEY)
+        sweep = runs.get(sweep_id) if sweep_id else None
+        if sweep_id and sweep is None:
+            st.warning("The previous citation sweep has expired - please run it again")
+            del st.session_state[CITATION_SWEEP_KEY]
+            st.query_params.pop(CITATION_SWEEP_KEY, None)
+        elif sweep is not None:
+            if sweep.running:
+                poll_citation_sweep(sweep.id)
+            else:
+                render_citation_sweep(sweep)
+    
+    with col2:
+        st.subheader("Citation Stats")
+        stats_brand = st.text_input("Brand Name (for stats)", placeholder="Asana")
+        if st.button("Get Stats"):
+            if stats_brand:
+                try:
+                    stats = client.citation_stats(stats_brand)
+                    st.metric("Overall Citation Rate", f"{stats.get('overall_rate', 0)}%")
+                    st.metric("Total Queries", stats.get('total_queries', 0))
+                    st.write(f"**ChatGPT Rate:** {stats.get('chatgpt_rate', 0)}%")
+                    st.write(f"**Claude Rate:** {stats.get('claude_rate', 0)}%")
+                except Exception as e:
+                    st.error(f"Error: {e}")
+    
+    end_coming_soon()
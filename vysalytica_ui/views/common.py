@@ -0,0 +1,107 @@
+"""Helpers shared by the feature pages."""
+import streamlit as st
+
+from vysalytica_ui.findings import FindingsIndex
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# CSS for blur overlay and "Coming Soon" message
+BLUR_OVERLAY_CSS = """
+<style>
+.blur-content {
+    filter: blur(8px);
+    pointer-events: none;
+    user-select: none;
+}
+.coming-soon-overlay {
+    position: fixed;
+    top: 50%;
+    left: 50%;
+    transform: translate(-50%, -50%);
+    background: rgba(15, 43, 70, 0.95);
+    padding: 60px 80px;
+    border-radius: 20px;
+    z-index: 9999;
+    box-shadow: 0 10px 40px rgba(0, 0, 0, 0.3);
+    border: 2px solid #6BC4FF;
+}
+.coming-soon-text {
+    color: white;
+    font-size: 48px;
+    font-weight: bold;
+    text-align: center;
+    margin: 0;
+    text-shadow: 0 2px 10px rgba(107, 196, 255, 0.5);
+}
+.coming-soon-subtext {
+    color: #6BC4FF;
+    font-size: 18px;
+    text-align: center;
+    margin-top: 10px;
+}
+</style>
+"""
+
+
+def coming_soon(feature):
+    """Blur the rest of the page behind a "Coming Soon" overlay.
+
+    Must be paired with ``end_coming_soon()`` after the page content.
+    """
+    st.markdown(BLUR_OVERLAY_CSS, unsafe_allow_html=True)
+    st.markdown(f"""
+        <div class="coming-soon-overlay">
+            <p class="coming-soon-text">Coming Soon</p>
+            <p class="coming-soon-subtext">{feature} launching soon</p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # Original content wrapped in blur div
+    st.markdown('<div class="blur-content">', unsafe_allow_html=True)
+
+
+def end_coming_soon():
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+def findings_viewer(index, key="findings"):
+    # ``key`` prefixes the widget keys, one per page that shows findings
+    col1, col2, col3 = st.columns([1, 1, 2])
+    categories = col1.multiselect("Category", index.categories, key=f"{key}_category")
+    statuses = col2.multiselect("Status", index.statuses, key=f"{key}_status")
+    query = col3.text_input("Search title, why and fix", key=f"{key}_query")
+    
+    view = index.filter(categories, statuses, query)
+    col1, col2, col3 = st.columns([1, 1, 2])
+    page_size = col1.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    pages = max(1, -(-len(view) // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = col2.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    col3.caption(f"Showing {len(view)} of {len(index)} findings - page {page}/{pages}")
+    
+    rows = FindingsIndex.page(view, page, page_size)
+    # Keyed by what is shown so a selection never carries over to other rows
+    view_key = hash((id(index), tuple(categories), tuple(statuses), query, page, page_size))
+    selection = st.dataframe(
+        rows,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"{key}_table_{view_key}",
+    )
+    
+    selected = [i for i in selection.selection.rows if i < len(rows)]
+    if not selected:
+        st.caption("Select a row to see its fix snippet and evidence")
+        return
+    f = index.detail(rows.index[selected[0]])
+    st.markdown(f"#### {f.get('title', 'Issue')} - {f.get('status', '')}")
+    st.write(f"**Category:** {f.get('category', '')}")
+    st.write(f"**Why:** {f.get('why', '')}")
+    st.write(f"**Fix:** {f.get('fix', '')}")
+    if f.get('fix_snippet'):
+        st.code(f['fix_snippet'], language="html")
+    if f.get('evidence'):
+        st.write(f"**Evidence:** {f.get('evidence')}")
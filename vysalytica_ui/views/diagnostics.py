@@ -0,0 +1,68 @@
+"""Diagnostics: backend health, API latency, error rates, cache hit ratio, rerun
+timings and per-session memory."""
+import streamlit as st
+
+from vysalytica_ui.api_client import get_client
+from vysalytica_ui.metrics import get_metrics
+from vysalytica_ui.session_memory import MB, get_memory_registry, get_session_memory
+
+client = get_client()
+metrics = get_metrics()
+
+
+def render():
+    st.header("Diagnostics")
+    st.caption("Process-wide metrics since the app server started")
+
+    if st.button("Refresh"):
+        st.rerun()
+
+    st.subheader("Backends")
+    st.dataframe(client.backends.status(), hide_index=True)
+
+    st.subheader("API calls by route")
+    st.dataframe(metrics.summary(), hide_index=True)
+
+    cache = client.cache.stats()
+    lookups = cache["hits"] + cache["misses"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cache hit ratio", f"{100 * cache['hits'] / lookups:.1f}%" if lookups else "n/a")
+    col2.metric("Cached responses", cache["entries"])
+    col3.metric("Cache size", f"{cache['bytes'] / 1024:.1f} KiB")
+
+    if client.store is not None:
+        store = client.store.stats()
+        col1, col2 = st.columns(2)
+        col1.metric("Stored audits", store["audits"])
+        col2.metric("Audit store size", f"{store['bytes'] / 1024:.1f} KiB")
+        st.caption(f"Audit store: `{store['path']}`")
+
+    quota = client.quota.status()
+    if quota:
+        st.subheader("API key quotas")
+        st.dataframe(quota, hide_index=True)
+
+    st.subheader("Script reruns by page")
+    st.dataframe(metrics.rerun_summary(), hide_index=True)
+
+    st.subheader("Session memory")
+    memory = get_session_memory()
+    usage = memory.usage()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("This session", f"{usage['memory_bytes'] / MB:.1f} MiB",
+                help=f"Budget {usage['budget_bytes'] / MB:.0f} MiB")
+    col2.metric("Spilled to disk", f"{usage['spilled_bytes'] / MB:.1f} MiB")
+    col3.metric("Evictions", usage["evictions"])
+    if col4.button("Free this session's results"):
+        memory.clear()
+        st.rerun()
+    st.dataframe(memory.entries(), hide_index=True)
+    sessions = get_memory_registry().usage()
+    st.caption(f"{len(sessions)} session(s), {sum(u['memory_bytes'] for u in sessions) / MB:.1f} MiB in memory, "
+               f"{sum(u['spilled_bytes'] for u in sessions) / MB:.1f} MiB spilled")
+    st.dataframe(sessions, hide_index=True)
+
+    st.subheader("Export")
+    col1, col2 = st.columns(2)
+    col1.download_button("📥 Prometheus text", metrics.to_prometheus(), "vysalytica_metrics.prom", "text/plain")
+    col2.download_button("📥 Events (JSON lines)", metrics.to_jsonl(), "vysalytica_events.jsonl", "application/jsonl")
@@ -0,0 +1,190 @@
+"""Audit history, audit details, audit comparison and score trends."""
+from functools import partial
+
+import streamlit as st
+
+from vysalytica_ui.api_client import get_client
+from vysalytica_ui.compare import AuditDiff, ScoreTrend
+from vysalytica_ui.findings import FindingsIndex
+from vysalytica_ui.paging import OffsetPager
+from vysalytica_ui.session_memory import estimate_size, get_session_memory
+from vysalytica_ui.jobs import get_prefetch_manager
+from vysalytica_ui.views.common import coming_soon, end_coming_soon, findings_viewer
+
+client = get_client()
+prefetch = get_prefetch_manager()
+
+HISTORY_PAGER_KEY = "history_pager"
+HISTORY_PAGE_KEY = "history_page"
+AUDIT_DETAIL_KEY = "audit_detail"
+COMPARE_KEY = "audit_compare"
+TREND_KEY = "score_trend"
+TREND_PAGE_SIZE = 100
+HISTORY_COLUMNS = ["id", "domain", "url", "overall_score", "page_count", "created_at", "packs", "local"]
+
+
+def render_history_browser(pager):
+    page = st.session_state.get(HISTORY_PAGE_KEY, 1)
+    try:
+        audits = pager.get_page(page)
+    except Exception as e:
+        st.error(f"Error: {e}")
+        return None
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    if col1.button("◀ Prev", disabled=page == 1):
+        st.session_state[HISTORY_PAGE_KEY] = page - 1
+        st.rerun()
+    col2.caption(f"Page {page} - {len(audits)} audit(s), {len(pager.pages)} page(s) loaded")
+    if col3.button("Next ▶", disabled=not pager.has_next(page)):
+        st.session_state[HISTORY_PAGE_KEY] = page + 1
+        st.rerun()
+    
+    rows = [{col: audit.get(col) for col in HISTORY_COLUMNS} for audit in audits]
+    stored = client.store.known_ids(row["id"] for row in rows) if client.store is not None else set()
+    for row in rows:
+        row["packs"] = ", ".join(row["packs"] or [])
+        row["local"] = row["id"] in stored
+    selection = st.dataframe(
+        rows,
+        hide_index=True,
+        column_order=HISTORY_COLUMNS,
+        column_config={"local": st.column_config.CheckboxColumn("Stored", help="Details load from the local audit store")},
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"history_table_{page}",
+    )
+    if selection.selection.rows:
+        return rows[selection.selection.rows[0]]["id"]
+    return None
+
+
+def load_audit_detail(audit_id):
+    """``(audit, findings index)`` for ``audit_id``, kept in session memory while it stays selected."""
+    memory = get_session_memory()
+    cached = memory.get(AUDIT_DETAIL_KEY)
+    if cached is None or cached[0] != audit_id:
+        audit = client.get_audit(audit_id)
+        cached = (audit_id, audit, FindingsIndex(audit.get("findings", [])))
+        memory.put(AUDIT_DETAIL_KEY, cached)
+    return cached[1], cached[2]
+
+
+def render_audit_detail(audit, index):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Overall Score", f"{int((audit.get('scores') or {}).get('overall', 0))}/100")
+    col2.metric("Pages Scanned", audit.get("page_count", 0))
+    col3.metric("Audit ID", audit.get("audit_id", audit.get("id", "N/A")))
+    st.caption(" · ".join(str(audit[k]) for k in ("url", "created_at") if audit.get(k))
+               + (" - loaded from the local audit store" if audit.get("stored_at") else ""))
+    findings_viewer(index, key="history_findings")
+
+
+def render_compare():
+    st.subheader("Compare Audits")
+    col1, col2, col3 = st.columns(3, vertical_alignment="bottom")
+    old_id = col1.number_input("Earlier audit ID", min_value=1, step=1, key="compare_old")
+    new_id = col2.number_input("Later audit ID", min_value=1, step=1, value=2, key="compare_new")
+    if col3.button("Compare"):
+        try:
+            get_session_memory().put(COMPARE_KEY, AuditDiff(client.get_audit(old_id), client.get_audit(new_id)))
+        except Exception as e:
+            st.error(f"Error: {e}")
+    
+    diff = get_session_memory().get(COMPARE_KEY)
+    if diff is None:
+        return
+    counts = diff.counts()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Score", diff.new_score if diff.new_score is not None else "N/A",
+                delta=diff.score_delta if diff.score_delta is not None else None)
+    col2.metric("Added", counts["added"], help="New issues and regressions from pass")
+    col3.metric("Resolved", counts["resolved"], help="Issues that now pass or are no longer reported")
+    col4.metric("Unchanged", counts["unchanged"], help=f"{counts['status_changed']} changed status")
+    st.caption(f"Audit {diff.old_id} → {diff.new_id}")
+    added, resolved, unchanged = st.tabs(["Added", "Resolved", "Unchanged"])
+    added.dataframe(diff.added, hide_index=True)
+    resolved.dataframe(diff.resolved, hide_index=True)
+    unchanged.dataframe(diff.unchanged, hide_index=True)
+
+
+def render_score_trend():
+    st.subheader("Score Trend")
+    col1, col2 = st.columns([3, 1], vertical_alignment="bottom")
+    domain = col1.text_input("Domain", placeholder="example.com", key="trend_domain")
+    if col2.button("Load Trend") and domain:
+        fetch = partial(client.audit_history, domain=domain)
+        trend = ScoreTrend(OffsetPager(fetch, prefetch, page_size=TREND_PAGE_SIZE))
+        try:
+            trend.load_more()
+        except Exception as e:
+            st.error(f"Error: {e}")
+        # The trend holds a pager bound to the client, so it is sized by its data
+        get_session_memory().put(TREND_KEY, (domain, trend), size=estimate_size(trend.df))
+    
+    saved = get_session_memory().get(TREND_KEY)
+    if saved is None:
+        return
+    domain, trend = saved
+    if not trend.exhausted and st.button(f"Load {TREND_PAGE_SIZE} older audits"):
+        try:
+            trend.load_more()
+        except Exception as e:
+            st.error(f"Error: {e}")
+        get_session_memory().put(TREND_KEY, saved, size=estimate_size(trend.df))
+    
+    daily = trend.daily()
+    if daily.empty:
+        st.info(f"No scored audits for {domain}")
+        return
+    st.line_chart(daily[["mean", "rolling_mean"]])
+    slope = trend.slope_per_week()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Audits", len(trend.df))
+    col2.metric("Latest score", int(trend.df["overall_score"].iloc[-1]))
+    col3.metric("Trend", f"{slope:+.1f}/week" if slope is not None else "N/A")
+    st.caption(f"{daily.index.min():%Y-%m-%d} to {daily.index.max():%Y-%m-%d}"
+               + ("" if trend.exhausted else " - older audits not loaded yet"))
+
+
+def render():
+    coming_soon("Reports & History")
+    
+    st.header("Audit History & Reports")
+    
+    col1, col2 = st.columns(2)
+    selected_id = None
+    
+    with col1:
+        st.subheader("Audit History")
+        history_domain = st.text_input("Filter by domain (optional)")
+        page_size = st.selectbox("Page size", [25, 50, 100], index=1)
+        
+        if st.button("Load History"):
+            fetch = partial(client.audit_history, domain=history_domain or None)
+            st.session_state[HISTORY_PAGER_KEY] = OffsetPager(fetch, prefetch, page_size=page_size)
+            st.session_state[HISTORY_PAGE_KEY] = 1
+        
+        pager = st.session_state.get(HISTORY_PAGER_KEY)
+        if pager is not None:
+            selected_id = render_history_browser(pager)
+    
+    with col2:
+        st.subheader("Get Audit Details")
+        audit_id = st.number_input("Audit ID", min_value=1, step=1)
+        
+        if st.button("Load Audit"):
+            selected_id = audit_id
+        
+        if selected_id is not None:
+            try:
+                audit, index = load_audit_detail(int(selected_id))
+            except Exception as e:
+                st.error(f"Error: {e}")
+            else:
+                render_audit_detail(audit, index)
+    
+    render_compare()
+    render_score_trend()
+    
+    end_coming_soon()
@@ -0,0 +1,61 @@
+"""API key management and plan listing."""
+import streamlit as st
+
+from vysalytica_ui.api_client import get_client
+from vysalytica_ui.views.common import coming_soon, end_coming_soon
+
+client = get_client()
+
+
+def render():
+    coming_soon("API Keys & Plans")
+    
+    st.header("API Keys & Plans")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Create API Key")
+        with st.form("api_key_form"):
+            key_name = st.text_input("Key Name (optional)", placeholder="My App Key")
+            quota = st.number_input("Quota per hour", min_value=1, max_value=1000, value=10)
+            create_key_btn = st.form_submit_button("Create Key")
+        
+        if create_key_btn:
+            try:
+                key_data = client.create_key(key_name, quota)
+                st.success("API Key created!")
+                st.code(key_data.get("key"), language="text")
+                st.caption("⚠️ Save this key - it won't be shown again")
+            except Exception as e:
+                st.error(f"Error: {e}")
+        
+        st.subheader("List API Keys")
+        if st.button("Load Keys"):
+            try:
+                keys = client.list_keys()
+                for key in keys:
+                    st.write(f"**{key.get('name', 'Unnamed')}** - {key.get('key')} - Active: {key.get('is_active')}")
+            except Exception as e:
+                st.error(f"Error: {e}")
+    
+    with col2:
+        st.subheader("Available Plans")
+        if st.button("Load Plans"):
+            try:
+                plans = client.plans()
+                for plan in plans:
+                    with st.expander(f"{plan.get('name')} - ${plan.get('price')}"):
+                        st.json(plan)
+            except Exception as e:
+                st.error(f"Error: {e}")
+        
+        st.subheader("Compare Plans")
+        if st.button("Show Comparison"):
+            try:
+                comparison = client.compare_plans()
+                st.json(comparison)
+            except Exception as e:
+                st.error(f"Error: {e}")
+    
+    end_coming_soon()
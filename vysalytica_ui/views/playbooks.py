@@ -0,0 +1,103 @@
+"""Playbook generator with Markdown/DOCX export."""
+import hashlib
+import json
+
+import streamlit as st
+
+from vysalytica_ui.api_client import get_client
+from vysalytica_ui.session_memory import get_session_memory
+from vysalytica_ui.views.common import coming_soon, end_coming_soon
+
+client = get_client()
+
+PLAYBOOK_KEY = "playbook"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def content_hash(playbook):
+    return hashlib.sha256(json.dumps(playbook, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def playbook_export(memory, kind, playbook_hash, playbook):
+    # Kept in the session's memory keyed by content hash, so each render is
+    # fetched from the API at most once; large DOCX files are spilled to disk
+    name = f"playbook_{kind}:{playbook_hash}"
+    data = memory.get(name)
+    if data is None:
+        data = client.playbook_markdown(playbook) if kind == "md" else client.playbook_docx(playbook)
+        memory.put(name, data)
+    return data
+
+
+def render_playbook(saved):
+    playbook, pb_domain, pb_hash = saved["playbook"], saved["domain"], saved["hash"]
+    # Download callables may run outside the script thread, so they get the
+    # memory object itself rather than looking it up in session state
+    memory = get_session_memory()
+    
+    st.subheader(f"Playbook: {playbook.get('intent', '')}")
+    st.write(f"**Target:** {playbook.get('target_assistant', '')}")
+    st.write(f"**Priority:** {playbook.get('priority', '')}")
+    
+    fixes = playbook.get("fixes", [])
+    st.write(f"**{len(fixes)} Fixes:**")
+    for i, fix in enumerate(fixes, 1):
+        with st.expander(f"{i}. {fix.get('title', 'Fix')}"):
+            st.write(f"**Why:** {fix.get('why', '')}")
+            st.write(f"**Language:** {fix.get('language', '')}")
+            if fix.get('snippet'):
+                st.code(fix['snippet'], language=fix.get('language', 'html'))
+    
+    # Download options: the export is generated when the button is clicked
+    st.subheader("Download Playbook")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Download as Markdown",
+            lambda: playbook_export(memory, "md", pb_hash, playbook),
+            f"{pb_domain}_playbook.md",
+            "text/markdown",
+            on_click="ignore",
+        )
+    with col2:
+        st.download_button(
+            "📥 Download as DOCX",
+            lambda: playbook_export(memory, "docx", pb_hash, playbook),
+            f"{pb_domain}_playbook.docx",
+            DOCX_MIME,
+            on_click="ignore",
+        )
+
+
+def render():
+    coming_soon("Playbooks")
+    
+    st.header("Playbook Generator")
+    st.write("Generate actionable playbooks to improve AI visibility for specific intents")
+    
+    with st.form("playbook_form"):
+        pb_domain = st.text_input("Domain", placeholder="example.com")
+        pb_intent = st.text_input("Intent", placeholder="best project management tools")
+        pb_assistant = st.selectbox("Target Assistant", ["chatgpt", "claude"])
+        pb_btn = st.form_submit_button("Generate Playbook")
+    
+    if pb_btn:
+        if pb_domain and pb_intent:
+            with st.spinner("Generating playbook..."):
+                try:
+                    playbook = client.generate_playbook(pb_domain, pb_intent, pb_assistant)
+                    get_session_memory().put(PLAYBOOK_KEY, {
+                        "playbook": playbook,
+                        "domain": pb_domain,
+                        "hash": content_hash(playbook),
+                    })
+                    st.success("Playbook generated!")
+                except Exception as e:
+                    st.error(f"Error: {e}")
+    
+    # Kept in session memory so that download clicks don't lose the playbook
+    saved = get_session_memory().get(PLAYBOOK_KEY)
+    if saved is not None:
+        render_playbook(saved)
+    
+    end_coming_soon()